@@ -0,0 +1,53 @@
+from absl import app, flags
+from ml_collections import config_flags
+
+from src.benchmark.allocations import benchmark_allocations
+from src.benchmark.assets import benchmark_assets
+from src.benchmark.atlas import benchmark_atlas
+from src.benchmark.attack import benchmark_attack
+from src.benchmark.batch import benchmark_batch
+from src.benchmark.bots import benchmark_bots
+from src.benchmark.camera import benchmark_camera
+from src.benchmark.collision import benchmark_collision
+from src.benchmark.draw import benchmark_draw
+from src.benchmark.hud import benchmark_hud
+from src.benchmark.physics import benchmark_physics
+from src.benchmark.profiler import benchmark_profiler
+from src.benchmark.stage import benchmark_stage
+from src.benchmark.startup import benchmark_startup
+from src.benchmark.text import benchmark_text
+from src.benchmark.trajectory import benchmark_trajectory
+from src.config import get_config
+
+BENCHMARKS = {
+    "startup": benchmark_startup,
+    "assets": benchmark_assets,
+    "atlas": benchmark_atlas,
+    "collision": benchmark_collision,
+    "allocations": benchmark_allocations,
+    "trajectory": benchmark_trajectory,
+    "physics": benchmark_physics,
+    "attack": benchmark_attack,
+    "batch": benchmark_batch,
+    "bots": benchmark_bots,
+    "camera": benchmark_camera,
+    "stage": benchmark_stage,
+    "draw": benchmark_draw,
+    "hud": benchmark_hud,
+    "text": benchmark_text,
+    "profiler": benchmark_profiler,
+}
+
+
+def run(_):
+    for name in flags.FLAGS.bench:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    config_flags.DEFINE_config_dict("game", get_config())
+    flags.DEFINE_multi_enum(
+        "bench", list(BENCHMARKS), list(BENCHMARKS), "Benchmarks to run."
+    )
+
+    app.run(run)
@@ -0,0 +1,28 @@
+import pygame
+from absl import app, flags
+from ml_collections import config_flags
+
+from src.batch import BatchSimulator
+from src.config import get_config
+
+FLAGS = flags.FLAGS
+
+
+def run(_):
+    try:
+        simulator = BatchSimulator(
+            matches=FLAGS.game.batch.matches,
+            ticks=FLAGS.game.batch.ticks,
+            seed=FLAGS.game.batch.seed,
+        )
+        stats = simulator.start()
+        stats.save(path=FLAGS.game.batch.output)
+        print(f"Saved to {FLAGS.game.batch.output}")
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    config_flags.DEFINE_config_dict("game", get_config())
+
+    app.run(run)
@@ -0,0 +1,22 @@
+import pygame
+from absl import app, flags
+from ml_collections import config_flags
+
+from src.config import get_config
+from src.headless import HeadlessEnvironment
+
+FLAGS = flags.FLAGS
+
+
+def run(_):
+    try:
+        environment = HeadlessEnvironment(seed=FLAGS.game.headless.seed)
+        environment.start(ticks=FLAGS.game.headless.ticks)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    config_flags.DEFINE_config_dict("game", get_config())
+
+    app.run(run)
@@ -3,21 +3,25 @@ from typing import *
 
 from absl import flags
 from pygame.color import Color
+from pygame.mask import Mask
 from pygame.rect import Rect
 from pygame.sprite import Sprite
 from pygame.surface import Surface
 
 from src.sprite.bound import HitboxRelPos
+from src.util.camera import Camera, blit_in_view
+from src.util.collision import CollisionWorld
 from src.util.image import get_surface
-from src.util.math import (
-    get_collided,
-    get_hitbox_from_rect,
-    get_reversed_hitbox_from_rect,
-)
-from src.util.types import Attribute, Milliseconds, Seconds
+from src.util.math import set_hitbox_from_rect, set_reversed_hitbox_from_rect
+from src.util.types import Attribute, Milliseconds, Seconds, StatusEffect
 
 FLAGS = flags.FLAGS
 
+Player_ = Any
+
+# Aseprite slice giving the attack's hitbox per frame, when the sheet has one
+ATTACK_SLICE = "hitbox"
+
 
 @dataclass
 class AttackSequence:
@@ -43,18 +47,37 @@ class AttackSequence:
         self.status = AttackSequence.DISABLED
         self.strike_status = None
 
+        # Set on the strike tick, until resolve_attacks collects the targets
+        self.striking = False
+        self.targets: list[Sprite] = []
+
+        self.debug = FLAGS.game.debug.attacks
+        self.hitbox_rect = Rect(0, 0, 0, 0)
+        self.frame_rect: Optional[Rect] = None
+
     @property
     def is_attacking(self) -> bool:
         return self.status != AttackSequence.DISABLED
 
+    @property
+    def is_striking(self) -> bool:
+        return self.striking
+
     @property
     def rect(self) -> Rect:
+        """Computed in place, the same rect is returned on every call."""
+        if self.frame_rect is not None:
+            return self.frame_rect
+
         if self.right_turn:
-            return get_hitbox_from_rect(rect=self.player_rect, hitbox=self.hitbox)
+            set_hitbox_from_rect(
+                out=self.hitbox_rect, rect=self.player_rect, hitbox=self.hitbox
+            )
         else:
-            return get_reversed_hitbox_from_rect(
-                rect=self.player_rect, hitbox=self.hitbox
+            set_reversed_hitbox_from_rect(
+                out=self.hitbox_rect, rect=self.player_rect, hitbox=self.hitbox
             )
+        return self.hitbox_rect
 
     @property
     def color(self) -> Color:
@@ -68,41 +91,56 @@ class AttackSequence:
         self.time = 0.0
         self.has_struck = False
 
-    def update_requirements(self, player_rect: Rect, right_turn: bool):
+    def update_requirements(
+        self, player_rect: Rect, right_turn: bool, frame_rect: Optional[Rect] = None
+    ):
+        """frame_rect is the current frame's hitbox, overriding self.hitbox."""
         self.player_rect = player_rect
         self.right_turn = right_turn
+        self.frame_rect = frame_rect
 
-    def update(self, delta: float, collisions: list[Sprite]):
+    def update(self, delta: float):
         self.time += delta
         if not self.has_struck and self.time >= self.strike_ms:
             self.has_struck = True
             self.status = AttackSequence.STRIKE
-            if collision := get_collided(rect=self.rect, collisions=collisions):
-                if Attribute.Health in collision.attributes:
-                    self.strike_status = AttackSequence.HIT
-                    return None
-            self.strike_status = AttackSequence.MISSED
+            self.striking = True
 
         elif self.time < self.total_ms:
             self.status = AttackSequence.RECOVERY
         else:
             self.status = AttackSequence.DISABLED
 
+    def resolve(self, targets: list[Sprite]):
+        self.striking = False
+        self.targets = targets
+        if targets:
+            self.strike_status = AttackSequence.HIT
+        else:
+            self.strike_status = AttackSequence.MISSED
+
     def cancel(self):
         self.status = AttackSequence.DISABLED
+        self.striking = False
 
-    def draw(self, surface: Surface):
-        if not FLAGS.game.debug.attacks:
+    def draw(self, surface: Surface, camera: Optional[Camera] = None) -> Optional[Rect]:
+        if not self.debug:
             return None
 
         if self.strike_status is None:
             return None
 
-        color_surface = get_surface(rect=self.rect, color=self.color)
-        surface.blit(color_surface, self.rect.topleft)
+        rect = self.rect
+        if camera is not None and not camera.is_visible(rect):
+            return None
+
+        color_surface = get_surface(rect=rect, color=self.color)
+        return blit_in_view(
+            surface=surface, source=color_surface, topleft=rect.topleft, camera=camera
+        )
 
     def debug_update(self, delta: float):
-        if not FLAGS.game.debug.attacks:
+        if not self.debug:
             return None
 
         if self.strike_status is None:
@@ -112,3 +150,58 @@ class AttackSequence:
         if self.debug_counter >= self.debug_duration:
             self.strike_status = None
             self.debug_counter = 0.0
+
+
+@dataclass
+class Hit:
+    attacker: Player_
+    target: Sprite
+
+
+def is_hittable(sprite: Sprite) -> bool:
+    if Attribute.Health not in sprite.attributes:
+        return False
+    return StatusEffect.Invulnerable not in sprite.status_effects
+
+
+FILLED_MASKS: dict[tuple[int, int], Mask] = {}
+
+
+def get_filled_mask(size: tuple[int, int]) -> Mask:
+    if size not in FILLED_MASKS:
+        FILLED_MASKS[size] = Mask(size, fill=True)
+    return FILLED_MASKS[size]
+
+
+def is_touching(rect: Rect, target: Sprite) -> bool:
+    """Pixel exact check, for targets with precomputed frame masks."""
+    found = target.get_mask()
+    if found is None:
+        return True
+
+    mask, (x, y) = found
+    offset = (rect.x - x, rect.y - y)
+    return mask.overlap(get_filled_mask(size=rect.size), offset) is not None
+
+
+def resolve_attacks(attackers: Iterable[Player_], world: CollisionWorld) -> list[Hit]:
+    """
+    Called once per tick after every update. All strikes of the tick are
+    collected first, then each one hits every hurtbox it overlaps, the
+    hitboxes of the dynamic sprites found through the world's spatial hash.
+    """
+    strikers = [attacker for attacker in attackers if attacker.attack.is_striking]
+
+    hits = []
+    for attacker in strikers:
+        hurtboxes = world.dynamic.query(rect=attacker.attack.rect, exclude=attacker)
+        targets = [
+            target
+            for target in hurtboxes
+            if is_hittable(sprite=target)
+            and is_touching(rect=attacker.attack.rect, target=target)
+        ]
+        attacker.attack.resolve(targets=targets)
+        hits.extend(Hit(attacker=attacker, target=target) for target in targets)
+
+    return hits
@@ -2,15 +2,14 @@ from dataclasses import dataclass
 from typing import *
 
 from absl import flags
-from pygame import Vector2
 from pygame.rect import Rect
-from pygame.sprite import Sprite
 
 from src.ability.motion import Motion
 from src.sprite.sheet import Spritesheet
+from src.util.collision import Collisions
 from src.util.input import is_new_only
 from src.util.logger import TextLogger
-from src.util.math import add_vector_to_rect, contain_rect_in_window, get_collided
+from src.util.math import contain_rect_in_stage, get_stage_bounds, move_rect_swept
 from src.util.state import ActionState
 from src.util.types import Pixels, StatusEffect
 
@@ -29,9 +28,14 @@ class DashSequence:
     LEFT: int = 0
     RIGHT: int = 1
 
+    STATUS_EFFECTS: tuple[StatusEffect, ...] = (StatusEffect.Invulnerable,)
+
     def __post_init__(self):
-        self.right_speed = Vector2(self.speed, 0)
-        self.left_speed = Vector2(-self.speed, 0)
+        self.right_speed = self.speed
+        self.left_speed = -self.speed
+
+        self.stage_bounds = get_stage_bounds()
+        self.scratch_rect = Rect(0, 0, 0, 0)
 
         self.status = DashSequence.DISABLE
         self.direction = None
@@ -56,8 +60,8 @@ class DashSequence:
         return self.travelled > self.distance
 
     @property
-    def status_effects(self) -> list[StatusEffect]:
-        return [StatusEffect.Invulnerable]
+    def status_effects(self) -> tuple[StatusEffect, ...]:
+        return DashSequence.STATUS_EFFECTS
 
     def text_log(self, text_logger: TextLogger):
         text_logger.add("Dash")
@@ -83,7 +87,8 @@ class DashSequence:
         animations: Spritesheet,
     ) -> bool:
         if is_new_only(old=old, new=new, attr="dash"):
-            if not self.is_dashing:
+            # A dash needs a held direction, update has no speed without one
+            if not self.is_dashing and (new.move_left or new.move_right):
                 animations.update_perf(new="dash")
                 self.start()
 
@@ -100,22 +105,28 @@ class DashSequence:
     def start(self):
         self.status = DashSequence.ENABLE
 
-    def update(self, player_rect: Rect, delta: float, collisions: list[Sprite]):
+    def update(self, player_rect: Rect, delta: float, collisions: Collisions):
         if self.direction == DashSequence.LEFT:
             speed = self.left_speed
         elif self.direction == DashSequence.RIGHT:
             speed = self.right_speed
 
-        new_rect = player_rect.copy()
+        new_rect = self.scratch_rect
+        new_rect.update(player_rect)
         displacement = speed * delta
-        add_vector_to_rect(rect=new_rect, vector=displacement)
-        contain_rect_in_window(rect=new_rect)
-
-        if get_collided(rect=new_rect, collisions=collisions) is not None:
+        new_rect.x += displacement
+        contain_rect_in_stage(rect=new_rect, bounds=self.stage_bounds)
+
+        contact = move_rect_swept(
+            rect=player_rect,
+            dx=new_rect.x - player_rect.x,
+            dy=new_rect.y - player_rect.y,
+            collisions=collisions,
+        )
+        if contact is not None:
             self.cancel()
         else:
-            player_rect.topleft = new_rect.topleft
-            self.travelled += displacement.length()
+            self.travelled += abs(displacement)
             if self.peaked_distance:
                 self.cancel()
 
@@ -3,18 +3,19 @@ from typing import *
 
 from absl import flags
 from pygame.rect import Rect
-from pygame.sprite import Sprite
 
 from src.ability.motion import Motion
+from src.util.collision import Collisions
 from src.util.input import is_new_only
 from src.util.logger import TextLogger
 from src.util.math import (
-    contain_rect_in_window,
-    get_collided,
+    contain_rect_in_stage,
     get_parabolic_peak_time,
-    get_parabolic_position,
+    get_stage_bounds,
+    move_rect_swept,
 )
 from src.util.state import ActionState
+from src.util.trajectory import get_jump_trajectory
 from src.util.types import Pixels, Seconds
 
 FLAGS = flags.FLAGS
@@ -32,10 +33,13 @@ class JumpSequence:
     def __post_init__(self):
         self.status = JumpSequence.DISABLE
         self.peak_time = get_parabolic_peak_time(duration=self.duration)
-        self.rel_peak_position = get_parabolic_position(
-            time=self.peak_time, duration=self.duration
+        self.trajectory = get_jump_trajectory(
+            duration=self.duration, length=self.length
         )
 
+        self.stage_bounds = get_stage_bounds()
+        self.scratch_rect = Rect(0, 0, 0, 0)
+
     @staticmethod
     def preload(text_logger: TextLogger):
         text_logger.preload("Jump")
@@ -87,26 +91,29 @@ class JumpSequence:
         self.start_height = player_rect.y
         self.time = 0.0
 
-    def update(self, player_rect: Rect, delta: float, collisions: list[Sprite]):
+    def update(self, player_rect: Rect, delta: float, collisions: Collisions):
         self.time += delta
 
-        rel_position = get_parabolic_position(time=self.time, duration=self.duration)
-        rel_length = round(rel_position / self.rel_peak_position, 3)
-        new_height = self.start_height - (self.length * rel_length)
+        new_height = self.start_height - self.trajectory.get_offset(time=self.time)
 
-        new_rect = player_rect.copy()
+        new_rect = self.scratch_rect
+        new_rect.update(player_rect)
         new_rect.y = new_height
-        contain_rect_in_window(rect=new_rect)
+        contain_rect_in_stage(rect=new_rect, bounds=self.stage_bounds)
 
         if self.time < self.peak_time:
             self.status = JumpSequence.RISING
         elif self.time > self.peak_time:
             self.status = JumpSequence.FALLING
 
-        if get_collided(rect=new_rect, collisions=collisions) is not None:
+        contact = move_rect_swept(
+            rect=player_rect,
+            dx=0,
+            dy=new_rect.y - player_rect.y,
+            collisions=collisions,
+        )
+        if contact is not None:
             self.cancel()
-        else:
-            player_rect.y = new_rect.y
 
         if self.time > self.duration:
             self.status = JumpSequence.DISABLE
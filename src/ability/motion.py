@@ -21,6 +21,9 @@ class Motion:
 
     def __post_init__(self):
         self.gravity = Vector2(0, self.gravity_)
+        # Returned by get_descend and get_move, valid until their next call
+        self.descend = Vector2(0, 0)
+        self.move = Vector2(0, 0)
         self.ms_amp = 1.0
 
         self.on_ground = False
@@ -88,10 +91,12 @@ class Motion:
         self.ms_amp = n
 
     def get_descend(self, delta: float) -> Vector2:
-        return self.gravity * delta
+        self.descend.y = self.gravity.y * delta
+        return self.descend
 
     def get_move(self, delta: float, action_state: ActionState) -> Vector2:
-        move = Vector2(0, 0)
+        move = self.move
+        move.x = 0
 
         left = action_state.move_left
         right = action_state.move_right
@@ -99,10 +104,10 @@ class Motion:
             return move
 
         if left:
-            move = Vector2(-1, 0)
+            move.x = -self.speed * delta
             self.last_facing = Motion.LEFT
         elif right:
-            move = Vector2(1, 0)
+            move.x = self.speed * delta
             self.last_facing = Motion.RIGHT
 
-        return move * self.speed * delta
+        return move
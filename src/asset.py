@@ -1,33 +1,160 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import *
+
 from absl import flags
+from pygame.surface import Surface
 
-from src.util.file_io import load_png, load_spritesheet_json
+from src.util.file_io import (
+    convert_png,
+    decode_png,
+    get_bytes_digest,
+    parse_spritesheet_json,
+    read_bytes,
+)
 from src.util.image import upscale_surface
 from src.util.types import SpritesheetDict
 
 FLAGS = flags.FLAGS
 
 
-def get_assets() -> dict:
+@dataclass
+class AssetTiming:
+    name: str
+    read: float = 0.0
+    decode: float = 0.0
+    convert: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.read + self.decode + self.convert
+
+
+@dataclass
+class LoadedAsset:
+    """Result of the worker thread, still waiting on the display-bound steps."""
+
+    name: str
+    image: Surface
+    timing: AssetTiming
+    frames: Optional[dict] = None
+    tags: Optional[list] = None
+    slices: Optional[dict] = None
+    digest: str = ""
+
+    @property
+    def is_spritesheet(self) -> bool:
+        return self.frames is not None
+
+
+def load_spritesheet_asset(name: str, png_path: str, json_path: str) -> LoadedAsset:
+    timing = AssetTiming(name=name)
+
+    start = time.perf_counter()
+    png_data = read_bytes(filepath=png_path)
+    json_data = read_bytes(filepath=json_path)
+    timing.read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    image = decode_png(data=png_data, filepath=png_path)
+    frames, tags, slices = parse_spritesheet_json(json_dict=json.loads(json_data))
+    digest = get_bytes_digest(chunks=[png_data, json_data])
+    timing.decode = time.perf_counter() - start
+
+    return LoadedAsset(
+        name=name,
+        image=image,
+        timing=timing,
+        frames=frames,
+        tags=tags,
+        slices=slices,
+        digest=digest,
+    )
+
+
+def load_image_asset(name: str, png_path: str) -> LoadedAsset:
+    timing = AssetTiming(name=name)
+
+    start = time.perf_counter()
+    png_data = read_bytes(filepath=png_path)
+    timing.read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    image = decode_png(data=png_data, filepath=png_path)
+    image = upscale_surface(surface=image)
+    timing.decode = time.perf_counter() - start
+
+    return LoadedAsset(name=name, image=image, timing=timing)
+
+
+def finalize_asset(loaded: LoadedAsset) -> Union[SpritesheetDict, Surface]:
+    """Runs on the main thread, convert_alpha needs the display."""
+    start = time.perf_counter()
+    surface = convert_png(image=loaded.image)
+    loaded.timing.convert = time.perf_counter() - start
+
+    if not loaded.is_spritesheet:
+        return surface
+
+    return SpritesheetDict(
+        image=surface,
+        frames=loaded.frames,
+        tags=loaded.tags,
+        digest=loaded.digest,
+        slices=loaded.slices,
+    )
+
+
+def print_asset_timings(timings: list[AssetTiming]):
+    print(f"{'Asset':<24} {'read':>9} {'decode':>9} {'convert':>9} {'total':>9}")
+    for t in sorted(timings, key=lambda t: t.total, reverse=True):
+        print(
+            f"{t.name:<24} {t.read * 1_000:7.2f}ms {t.decode * 1_000:7.2f}ms "
+            f"{t.convert * 1_000:7.2f}ms {t.total * 1_000:7.2f}ms"
+        )
+
+
+def get_assets_timed() -> tuple[dict, list[AssetTiming]]:
+    paths = FLAGS.game.path
+    pngs = paths.get("png", {})
+    jsons = paths.get("json", {})
+
     asset = {}
-    parsed_pngs = []
-
-    for file_type in FLAGS.game.path:
-        if file_type == "json":
-            for file in FLAGS.game.path[file_type]:
-                surface = load_png(filepath=FLAGS.game.path.png[file])
-                frames, tags = load_spritesheet_json(
-                    filepath=FLAGS.game.path[file_type][file]
+    timings = []
+    with ThreadPoolExecutor(max_workers=FLAGS.game.images.load_workers) as pool:
+        futures = []
+        for file in jsons:
+            futures.append(
+                pool.submit(
+                    load_spritesheet_asset,
+                    name=file,
+                    png_path=pngs[file],
+                    json_path=jsons[file],
                 )
-                asset[file] = SpritesheetDict(image=surface, frames=frames, tags=tags)
-                parsed_pngs.append(file)
+            )
+
+        for file in pngs:
+            if file in jsons:
+                continue
+
+            futures.append(
+                pool.submit(load_image_asset, name=file, png_path=pngs[file])
+            )
 
-        elif file_type == "png":
-            for file in FLAGS.game.path[file_type]:
-                if file in parsed_pngs:
-                    continue
+        # Kept in submission order so the dict matches the sequential loader
+        for future in futures:
+            loaded = future.result()
+            asset[loaded.name] = finalize_asset(loaded=loaded)
+            timings.append(loaded.timing)
 
-                surface = load_png(filepath=FLAGS.game.path.png[file])
-                scaled_surface = upscale_surface(surface=surface)
-                asset[file] = scaled_surface
+    return asset, timings
+
+
+def get_assets() -> dict:
+    asset, timings = get_assets_timed()
+    if FLAGS.game.debug.assets:
+        print_asset_timings(timings=timings)
 
     return asset
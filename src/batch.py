@@ -0,0 +1,231 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import *
+
+import numpy as np
+from absl import flags
+from ml_collections import ConfigDict, config_flags
+
+from src.ability.attack import AttackSequence
+from src.asset import get_assets
+from src.cluster.stage import Stage, create_stage
+from src.headless import HeadlessEnvironment, init_headless_display
+from src.util.math import get_stage_bounds
+
+FLAGS = flags.FLAGS
+
+PLAYERS = 2
+
+# Loaded once per worker process, shared by every match it simulates
+WORKER_ASSET: Optional[dict] = None
+WORKER_STAGE: Optional[Stage] = None
+
+
+@dataclass
+class MatchStats:
+    """
+    Totals per player over one or more matches, the heatmap counts the ticks
+    each player's center spent in every cell of the stage.
+    """
+
+    matches: int
+    ticks: int
+    strikes: np.ndarray
+    hits: np.ndarray
+    jumps: np.ndarray
+    dashes: np.ndarray
+    heatmap: np.ndarray
+
+    @staticmethod
+    def empty() -> "MatchStats":
+        rows, cols = get_heatmap_shape()
+        return MatchStats(
+            matches=0,
+            ticks=0,
+            strikes=np.zeros(PLAYERS, dtype=np.int64),
+            hits=np.zeros(PLAYERS, dtype=np.int64),
+            jumps=np.zeros(PLAYERS, dtype=np.int64),
+            dashes=np.zeros(PLAYERS, dtype=np.int64),
+            heatmap=np.zeros((PLAYERS, rows, cols), dtype=np.int64),
+        )
+
+    @property
+    def hit_rate(self) -> np.ndarray:
+        return self.hits / np.maximum(self.strikes, 1)
+
+    def merge(self, other: "MatchStats"):
+        self.matches += other.matches
+        self.ticks += other.ticks
+        self.strikes += other.strikes
+        self.hits += other.hits
+        self.jumps += other.jumps
+        self.dashes += other.dashes
+        self.heatmap += other.heatmap
+
+    def save(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            matches=self.matches,
+            ticks=self.ticks,
+            strikes=self.strikes,
+            hits=self.hits,
+            jumps=self.jumps,
+            dashes=self.dashes,
+            heatmap=self.heatmap,
+        )
+
+
+def get_heatmap_shape() -> tuple[int, int]:
+    cell = FLAGS.game.batch.heatmap_cell
+    bounds = get_stage_bounds()
+    return math.ceil(bounds.height / cell), math.ceil(bounds.width / cell)
+
+
+def add_to_heatmap(heatmap: np.ndarray, centers: np.ndarray):
+    """Centers is (ticks, players, 2), one histogram per player."""
+    cell = FLAGS.game.batch.heatmap_cell
+    bounds = get_stage_bounds()
+    _, rows, cols = heatmap.shape
+
+    col = np.clip((centers[..., 0] - bounds.left) // cell, 0, cols - 1)
+    row = np.clip((centers[..., 1] - bounds.top) // cell, 0, rows - 1)
+    player = np.broadcast_to(np.arange(PLAYERS), col.shape)
+    np.add.at(heatmap, (player.ravel(), row.ravel(), col.ravel()), 1)
+
+
+def simulate_match(asset: dict, stage: Stage, seed: int, ticks: int) -> MatchStats:
+    environment = HeadlessEnvironment(seed=seed, asset=asset, stage=stage)
+    players = (environment.player_1, environment.player_2)
+
+    stats = MatchStats.empty()
+    centers = np.empty((ticks, PLAYERS, 2), dtype=np.int64)
+    jumping = [False] * PLAYERS
+    dashing = [False] * PLAYERS
+
+    for tick in range(ticks):
+        environment.step()
+        for idx, player in enumerate(players):
+            centers[tick, idx] = player.rect.center
+
+            attack = player.attack
+            if attack.status == AttackSequence.STRIKE:
+                stats.strikes[idx] += 1
+                if attack.strike_status == AttackSequence.HIT:
+                    stats.hits[idx] += 1
+
+            # Starts are counted, a jump or dash spans many ticks
+            is_jumping = player.jump.is_jumping
+            if is_jumping and not jumping[idx]:
+                stats.jumps[idx] += 1
+            jumping[idx] = is_jumping
+
+            is_dashing = player.dash.is_dashing
+            if is_dashing and not dashing[idx]:
+                stats.dashes[idx] += 1
+            dashing[idx] = is_dashing
+
+    add_to_heatmap(heatmap=stats.heatmap, centers=centers)
+    stats.matches = 1
+    stats.ticks = ticks
+    return stats
+
+
+def init_worker(config: ConfigDict):
+    global WORKER_ASSET, WORKER_STAGE
+
+    # Spawned workers import the modules again and start without flags
+    if "game" not in FLAGS:
+        config_flags.DEFINE_config_dict("game", config)
+    if not FLAGS.is_parsed():
+        FLAGS(["batch"])
+
+    init_headless_display()
+    WORKER_ASSET = get_assets()
+    WORKER_STAGE = create_stage()
+
+
+def simulate_matches(seeds: list[int], ticks: int) -> MatchStats:
+    stats = MatchStats.empty()
+    for seed in seeds:
+        stats.merge(
+            simulate_match(
+                asset=WORKER_ASSET, stage=WORKER_STAGE, seed=seed, ticks=ticks
+            )
+        )
+    return stats
+
+
+def get_worker_count() -> int:
+    workers = FLAGS.game.batch.workers
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+class BatchSimulator:
+    """
+    Thousands of randomized bot-vs-bot matches spread over a process pool.
+    Every match has its own seed, so the totals do not depend on how the
+    matches were split between the workers.
+    """
+
+    def __init__(
+        self, matches: int, ticks: int, seed: int = 0, workers: Optional[int] = None
+    ) -> None:
+        self.matches = matches
+        self.ticks = ticks
+        self.seed = seed
+        self.workers = get_worker_count() if workers is None else workers
+
+    def get_chunks(self) -> list[list[int]]:
+        size = FLAGS.game.batch.chunk_size
+        seeds = list(range(self.seed, self.seed + self.matches))
+        return [seeds[idx : idx + size] for idx in range(0, len(seeds), size)]
+
+    def run(self) -> MatchStats:
+        # A loaded stage sets the stage size, before the heatmaps are sized
+        # and the config is handed to the workers
+        create_stage()
+        stats = MatchStats.empty()
+        chunks = self.get_chunks()
+
+        if self.workers == 1:
+            init_worker(config=FLAGS.game)
+            for seeds in chunks:
+                stats.merge(simulate_matches(seeds=seeds, ticks=self.ticks))
+            return stats
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init_worker,
+            initargs=(FLAGS.game,),
+        ) as executor:
+            results = executor.map(simulate_matches, chunks, [self.ticks] * len(chunks))
+            for result in results:
+                stats.merge(result)
+        return stats
+
+    def start(self) -> MatchStats:
+        start = time.perf_counter()
+        stats = self.run()
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"Batch: {stats.matches} matches, {stats.ticks:,} ticks on "
+            f"{self.workers} workers in {elapsed:.2f}s | "
+            f"{stats.matches / elapsed:,.1f} matches/s, "
+            f"{stats.ticks / elapsed:,.0f} ticks/s"
+        )
+        minutes = stats.ticks * FLAGS.game.clock.tick_delta / 60
+        for idx in range(PLAYERS):
+            print(
+                f"Player {idx + 1}: {stats.strikes[idx]} strikes, "
+                f"{stats.hits[idx]} hits ({stats.hit_rate[idx]:.1%}) | "
+                f"{stats.jumps[idx] / minutes:.1f} jumps, "
+                f"{stats.dashes[idx] / minutes:.1f} dashes per minute"
+            )
+
+        return stats
@@ -0,0 +1,137 @@
+import gc
+import itertools
+import statistics
+import tracemalloc
+from typing import *
+
+from absl import flags
+
+from src.asset import get_assets
+from src.cluster.platform import create_test_platforms
+from src.cluster.player import Player
+from src.headless import init_headless_display
+from src.util.collision import CollisionWorld
+from src.util.state import ActionState
+
+FLAGS = flags.FLAGS
+
+# Floats and ints above 256 are boxed by CPython, so a tick can never be
+# entirely allocation free, reading rect coordinates makes a few short lived
+TICK_PEAK_BUDGET = 320
+# Any single tick after the warm-up, a state change (jump start, new grid
+# cells, animation switch) may not build more than a few boxed numbers
+TICK_MAX_BUDGET = 640
+# Timers of a running ability are replaced floats, the one alive at the end
+# of the measure may not come from the free list
+RETAINED_BUDGET = 128
+# Nothing is replaced while idle or walking, every byte kept is a leak
+ZERO_RETAINED = ("idle", "move left", "move right")
+
+
+def create_actions(**kwargs) -> ActionState:
+    actions = ActionState(source="Scripted")
+    for name, value in kwargs.items():
+        setattr(actions, name, value)
+    return actions
+
+
+def create_scripted_actions() -> list[tuple[str, ActionState, int]]:
+    """Actions are pressed once every period ticks, held when it is 1."""
+    return [
+        ("idle", create_actions(), 1),
+        ("move left", create_actions(move_left=1), 1),
+        ("move right", create_actions(move_right=1), 1),
+        ("jump", create_actions(jump_up=1), 60),
+        ("dash", create_actions(move_right=1, dash=1), 30),
+        ("attack", create_actions(attack=1), 20),
+    ]
+
+
+def measure_peaks(tick: Callable[[], Any], ticks: int) -> list[int]:
+    """Transient bytes allocated on top of what was held before each tick."""
+    peaks = [0] * ticks
+    gc.collect()
+    tracemalloc.start()
+    for idx in range(ticks):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        tick()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks[idx] = peak - before
+    tracemalloc.stop()
+    return peaks
+
+
+def measure_retained(tick: Callable[[], Any], ticks: int) -> int:
+    """
+    Growth over the second half, the first half replaces what was allocated
+    before tracing (reused buffers, current values) so only leaks remain.
+    """
+    gc.collect()
+    tracemalloc.start()
+    # A range would leave its last boxed index alive
+    for _ in itertools.repeat(None, ticks):
+        tick()
+    gc.collect()
+    start, _ = tracemalloc.get_traced_memory()
+    for _ in itertools.repeat(None, ticks):
+        tick()
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return end - start
+
+
+def benchmark_allocations(ticks: int = 600, warmup: int = 120):
+    init_headless_display()
+    asset = get_assets()
+    delta = FLAGS.game.clock.tick_delta
+
+    player_1 = Player(sheet=asset["green-slime"], rel_x=0.4)
+    player_2 = Player(sheet=asset["blue-slime"], rel_x=0.6, face_left=True)
+
+    world = CollisionWorld()
+    world.add_static(*create_test_platforms())
+    world.add_dynamic(player_1, player_2)
+    bodies = [
+        (player_1, world.view(owner=player_1)),
+        (player_2, world.view(owner=player_2)),
+    ]
+
+    idle = create_actions()
+    counter = 0
+
+    print(f"tracemalloc per tick, 2 players, {ticks} ticks per action")
+    failed = []
+    for name, pressed, period in create_scripted_actions():
+
+        def tick():
+            nonlocal counter
+            counter += 1
+            actions = pressed if counter % period == 0 else idle
+            for body, view in bodies:
+                body.save_state()
+                body.receive_actions(actions=actions)
+                body.update(delta=delta, collisions=view)
+                world.update(sprite=body)
+
+        for _ in range(warmup):
+            tick()
+
+        peaks = measure_peaks(tick=tick, ticks=ticks)
+        retained = measure_retained(tick=tick, ticks=ticks)
+        median = int(statistics.median(peaks))
+        peak = max(peaks)
+        print(
+            f"{name:<36} median {median:5d} B | max {peak:5d} B"
+            f" | retained {retained:5d} B"
+        )
+        if (
+            median > TICK_PEAK_BUDGET
+            or peak > TICK_MAX_BUDGET
+            or retained > RETAINED_BUDGET
+            or (name in ZERO_RETAINED and retained != 0)
+        ):
+            failed.append(name)
+
+    assert not failed, f"Allocation budget exceeded by: {', '.join(failed)}"
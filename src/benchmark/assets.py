@@ -0,0 +1,44 @@
+from absl import flags
+from ml_collections import ConfigDict
+
+from src.asset import get_assets_timed, print_asset_timings
+from src.benchmark.common import print_timings, time_call
+from src.headless import init_headless_display
+
+FLAGS = flags.FLAGS
+
+
+def get_copied_paths(paths: ConfigDict, copies: int) -> ConfigDict:
+    """Simulates a bigger asset folder by registering every file n times."""
+    copied = ConfigDict()
+    for extension in paths:
+        copied[extension] = ConfigDict()
+        for name in paths[extension]:
+            for idx in range(copies):
+                copied[extension][f"{name}-{idx}"] = paths[extension][name]
+
+    return copied
+
+
+def benchmark_assets(repeat: int = 5, copies: tuple[int, ...] = (1, 8, 32)):
+    init_headless_display()
+
+    original_paths = FLAGS.game.path
+    original_workers = FLAGS.game.images.load_workers
+
+    try:
+        _, timings = get_assets_timed()
+        print("Per asset timings")
+        print_asset_timings(timings=timings)
+        print()
+
+        for n in copies:
+            FLAGS.game.path = get_copied_paths(paths=original_paths, copies=n)
+            print(f"get_assets() with every asset registered x{n}")
+            for workers in (1, original_workers):
+                FLAGS.game.images.load_workers = workers
+                timings = time_call(function=get_assets_timed, repeat=repeat)
+                print_timings(title=f"{workers} worker(s)", timings=timings)
+    finally:
+        FLAGS.game.path = original_paths
+        FLAGS.game.images.load_workers = original_workers
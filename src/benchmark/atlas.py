@@ -0,0 +1,48 @@
+from absl import flags
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.headless import init_headless_display
+from src.sprite.sheet import Spritesheet
+from src.sprite.store import FRAME_STORE
+from src.util.types import SpritesheetDict
+
+FLAGS = flags.FLAGS
+
+
+def benchmark_atlas(repeat: int = 5, players: int = 8, rounds: int = 20):
+    screen = init_headless_display()
+    asset = get_assets()
+    sheets = [value for value in asset.values() if isinstance(value, SpritesheetDict)]
+
+    original_atlas = FLAGS.game.images.atlas
+    try:
+        for atlas in (False, True):
+            FLAGS.game.images.atlas = atlas
+            FRAME_STORE.clear()
+
+            animations = []
+            for idx in range(players):
+                sheet = Spritesheet(spritesheet=sheets[idx % len(sheets)])
+                for tag in sheet.spritesheet.tags:
+                    animations.append(getattr(sheet, tag["name"]))
+
+            def draw_all_frames():
+                for _ in range(rounds):
+                    for animation in animations:
+                        for idx_frame in range(animation.n_frames):
+                            animation.frame_idx = idx_frame
+                            animation.draw(surface=screen, topleft=(0, 0))
+                            animation.draw(surface=screen, topleft=(0, 0), hz_flip=True)
+
+            draw_all_frames()  # Warm up, packs the mirrored frames
+            blits = rounds * 2 * sum(animation.n_frames for animation in animations)
+
+            print(f"Atlas {'enabled' if atlas else 'disabled'}")
+            print(FRAME_STORE.report())
+            timings = time_call(function=draw_all_frames, repeat=repeat)
+            print_timings(title=f"{blits} frame blits", timings=timings)
+            print()
+    finally:
+        FLAGS.game.images.atlas = original_atlas
+        FRAME_STORE.clear()
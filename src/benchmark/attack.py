@@ -0,0 +1,103 @@
+import random
+
+from absl import flags
+
+from src.ability.attack import is_hittable, resolve_attacks
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.cluster.player import Player
+from src.headless import init_headless_display
+from src.util.collision import CollisionWorld
+
+FLAGS = flags.FLAGS
+
+
+def create_crowd(asset: dict, count: int, seed: int = 0) -> list[Player]:
+    """Players spread over a stage that grows with them, all mid-strike."""
+    rng = random.Random(seed)
+    stage_width = count * 60
+
+    crowd = []
+    for idx in range(count):
+        player = Player(sheet=asset["green-slime"], rel_x=0.5, face_left=idx % 2)
+        player.rect.x = rng.randrange(0, stage_width)
+        player.rect.y = rng.randrange(0, 4) * 90
+        player.attack.update_requirements(
+            player_rect=player.rect, right_turn=player.motion.right_turn
+        )
+        crowd.append(player)
+    return crowd
+
+
+def start_strikes(crowd: list[Player]):
+    for player in crowd:
+        player.attack.start()
+        player.attack.update(delta=player.attack.strike_ms)
+
+
+def resolve_pairwise(crowd: list[Player]) -> int:
+    hits = 0
+    for attacker in crowd:
+        rect = attacker.attack.rect
+        targets = [
+            target
+            for target in crowd
+            if target is not attacker
+            and rect.colliderect(target.rect)
+            and is_hittable(sprite=target)
+        ]
+        attacker.attack.resolve(targets=targets)
+        hits += len(targets)
+    return hits
+
+
+def benchmark_attack(repeat: int = 5, sizes: list[int] = None):
+    init_headless_display()
+    asset = get_assets()
+
+    if sizes is None:
+        sizes = [16, 128, 512]
+
+    for size in sizes:
+        crowd = create_crowd(asset=asset, count=size)
+        world = CollisionWorld()
+        world.add_dynamic(*crowd)
+
+        start_strikes(crowd=crowd)
+        pairwise_hits = resolve_pairwise(crowd=crowd)
+        start_strikes(crowd=crowd)
+        indexed_hits = len(resolve_attacks(attackers=crowd, world=world))
+
+        print(f"{size} attackers and defenders, all striking")
+        timings = time_call(
+            function=lambda: resolve_pairwise(crowd=crowd),
+            repeat=repeat,
+            setup=lambda: start_strikes(crowd=crowd),
+        )
+        print_timings(title="pairwise overlap tests", timings=timings)
+        timings = time_call(
+            function=lambda: resolve_attacks(attackers=crowd, world=world),
+            repeat=repeat,
+            setup=lambda: start_strikes(crowd=crowd),
+        )
+        print_timings(title="resolve_attacks, hashed hurtboxes", timings=timings)
+        print(f"{'hits':<36} pairwise {pairwise_hits} | indexed {indexed_hits}")
+
+        original_masks = FLAGS.game.collision.masks
+        try:
+            FLAGS.game.collision.masks = True
+            crowd = create_crowd(asset=asset, count=size)
+        finally:
+            FLAGS.game.collision.masks = original_masks
+        world = CollisionWorld()
+        world.add_dynamic(*crowd)
+
+        start_strikes(crowd=crowd)
+        masked_hits = len(resolve_attacks(attackers=crowd, world=world))
+        timings = time_call(
+            function=lambda: resolve_attacks(attackers=crowd, world=world),
+            repeat=repeat,
+            setup=lambda: start_strikes(crowd=crowd),
+        )
+        print_timings(title="resolve_attacks, pixel masks", timings=timings)
+        print(f"{'hits touching opaque pixels':<36} {masked_hits}")
@@ -0,0 +1,26 @@
+import os
+
+from absl import flags
+
+from src.batch import BatchSimulator
+from src.benchmark.common import print_timings, time_call
+
+FLAGS = flags.FLAGS
+
+
+def benchmark_batch(repeat: int = 3, matches: int = 16, ticks: int = 600):
+    cores = os.cpu_count() or 1
+    counts = sorted(
+        {1, *(2**power for power in range(8) if 2**power <= cores), cores}
+    )
+
+    print(f"{matches} matches of {ticks} ticks, {cores} cores")
+    single = None
+    for workers in counts:
+        simulator = BatchSimulator(matches=matches, ticks=ticks, workers=workers)
+        timings = time_call(function=simulator.run, repeat=repeat)
+        print_timings(title=f"{workers} workers", timings=timings)
+
+        fastest = min(timings)
+        single = fastest if single is None else single
+        print(f"{'speedup':<36} {single / fastest:.2f}x of {workers}x")
@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+from absl import flags
+from pygame import Rect
+from pygame.sprite import Sprite
+
+from src.benchmark.common import print_timings, time_call
+from src.util.state import (
+    ACTION_BITS,
+    ActionStateBatchRandomizer,
+    ActionStateRandomizer,
+)
+
+FLAGS = flags.FLAGS
+
+COMPARED_ACTIONS = ("move_left", "move_right", "jump_up", "jump_down", "dash", "attack")
+
+
+def create_pairs(count: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Bots and the players they chase, some within attack range."""
+    rng = np.random.default_rng(seed)
+    computers = np.zeros((count, 4))
+    players = np.zeros((count, 4))
+    computers[:, 0] = rng.integers(0, 1_200, count)
+    computers[:, 1] = rng.integers(0, 600, count)
+    players[:, 0] = computers[:, 0] + rng.integers(-300, 300, count)
+    players[:, 1] = rng.integers(0, 600, count)
+    computers[:, 2:] = players[:, 2:] = (80, 84)
+    return computers, players
+
+
+def create_sprites(rects: np.ndarray) -> list[Sprite]:
+    sprites = []
+    for rect in rects.astype(int).tolist():
+        sprite = Sprite()
+        sprite.rect = Rect(rect)
+        sprites.append(sprite)
+    return sprites
+
+
+def get_action_rates(masks: np.ndarray) -> dict[str, float]:
+    return {name: np.mean(masks & ACTION_BITS[name] != 0) for name in COMPARED_ACTIONS}
+
+
+def compare_rates(count: int = 1_000, ticks: int = 600):
+    """Both randomizers on the same positions should press alike."""
+    computers, players = create_pairs(count=count)
+    computer_sprites = create_sprites(rects=computers)
+    player_sprites = create_sprites(rects=players)
+
+    random.seed(0)
+    bots = [ActionStateRandomizer() for _ in range(count)]
+    single = np.zeros((ticks, count), dtype=np.uint16)
+    batch = ActionStateBatchRandomizer(count=count, seed=0)
+    batched = np.zeros((ticks, count), dtype=np.uint16)
+    for tick in range(ticks):
+        for idx, bot in enumerate(bots):
+            actions = bot.get_random_actions(
+                player=player_sprites[idx], computer=computer_sprites[idx]
+            )
+            single[tick, idx] = actions.to_bits()
+        batched[tick] = batch.get_random_actions(computers=computers, players=players)
+
+    single_rates = get_action_rates(masks=single)
+    batched_rates = get_action_rates(masks=batched)
+    print(f"Pressed per tick, {count} bots over {ticks} ticks")
+    for name in COMPARED_ACTIONS:
+        print(
+            f"{name:<36} randomizer {single_rates[name]:6.3f} | "
+            f"batched {batched_rates[name]:6.3f}"
+        )
+
+
+def benchmark_bots(repeat: int = 5, ticks: int = 60, sizes: list[int] = None):
+    if sizes is None:
+        sizes = [2, 1_000, 10_000]
+
+    compare_rates()
+    for size in sizes:
+        print(f"{size} bots, {ticks} ticks")
+        computers, players = create_pairs(count=size)
+        computer_sprites = create_sprites(rects=computers)
+        player_sprites = create_sprites(rects=players)
+        pairs = list(zip(computer_sprites, player_sprites))
+
+        def run_single():
+            bots = [ActionStateRandomizer() for _ in range(size)]
+            for _ in range(ticks):
+                for bot, (computer, player) in zip(bots, pairs):
+                    bot.get_random_actions(player=player, computer=computer)
+
+        def run_batched():
+            batch = ActionStateBatchRandomizer(count=size, seed=0)
+            for _ in range(ticks):
+                batch.get_random_actions(computers=computers, players=players)
+
+        print_timings(
+            title="ActionStateRandomizer per bot",
+            timings=time_call(function=run_single, repeat=repeat),
+        )
+        print_timings(
+            title="ActionStateBatchRandomizer",
+            timings=time_call(function=run_batched, repeat=repeat),
+        )
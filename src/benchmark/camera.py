@@ -0,0 +1,99 @@
+import random
+
+from absl import flags
+from pygame.sprite import Group
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.cluster.platform import Platform
+from src.cluster.player import Player
+from src.headless import init_headless_display
+from src.util.camera import Camera
+
+FLAGS = flags.FLAGS
+
+
+def create_scrolling_platforms(screens: int) -> Group:
+    """The test stage's ledges repeated once per window width."""
+    platforms = Group(
+        Platform(
+            rel_x=0.0, rel_y=0.55, rel_width=1.0, rel_height=0.5, disable_debug=True
+        )
+    )
+    for screen in range(screens):
+        for rel_x, rel_y, rel_width in (
+            (0.335, 0.36, 0.3282),
+            (0.069, 0.205, 0.207),
+            (0.725, 0.205, 0.207),
+        ):
+            platforms.add(
+                Platform(
+                    rel_x=(screen + rel_x) / screens,
+                    rel_y=rel_y,
+                    rel_width=rel_width / screens,
+                    rel_height=0.063,
+                )
+            )
+    return platforms
+
+
+def benchmark_camera(
+    repeat: int = 5, screens: int = 16, players: int = 256, frames: int = 120
+):
+    screen = init_headless_display()
+    asset = get_assets()
+
+    original_width = FLAGS.game.stage.width
+    original_bounds = FLAGS.game.debug.bounds
+    try:
+        FLAGS.game.stage.width = FLAGS.game.window.width * screens
+        FLAGS.game.debug.bounds = True
+        platforms = create_scrolling_platforms(screens=screens)
+        rng = random.Random(0)
+        crowd = [
+            Player(sheet=asset["green-slime"], rel_x=rng.uniform(0.0, 1.0))
+            for _ in range(players)
+        ]
+        camera = Camera()
+    finally:
+        FLAGS.game.stage.width = original_width
+
+    step = (camera.stage.width - camera.view.width) // frames
+    views = [camera.view.width // 2 + step * frame for frame in range(frames)]
+
+    def draw_everything():
+        for _ in views:
+            for land in platforms:
+                land.show_bounds(surface=screen)
+            for player in crowd:
+                player.draw(surface=screen)
+                player.draw_bounds(surface=screen)
+
+    def draw_in_view():
+        drawn = 0
+        for x in views:
+            camera.look_at(x=x, y=camera.stage.centery)
+            for land in camera.cull(sprites=platforms):
+                land.show_bounds(surface=screen, camera=camera)
+            for player in crowd:
+                drawn += player.draw(surface=screen, camera=camera) is not None
+                player.draw_bounds(surface=screen, camera=camera)
+        return drawn
+
+    try:
+        drawn = draw_in_view()
+        print(
+            f"Scrolling stage, {screens} windows wide, {len(platforms)} platforms, "
+            f"{players} players, {frames} frames"
+        )
+        print_timings(
+            title="draw everything, no camera",
+            timings=time_call(function=draw_everything, repeat=repeat),
+        )
+        print_timings(
+            title="camera, culled to the view",
+            timings=time_call(function=draw_in_view, repeat=repeat),
+        )
+        print(f"{'players drawn per frame':<36} {drawn / frames:.1f} of {players}")
+    finally:
+        FLAGS.game.debug.bounds = original_bounds
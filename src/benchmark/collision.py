@@ -0,0 +1,217 @@
+import random
+
+from absl import flags
+from pygame.rect import Rect
+from pygame.sprite import Group
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.cluster.platform import Platform
+from src.cluster.player import Player
+from src.headless import HeadlessEnvironment, init_headless_display
+from src.util.collision import CollisionWorld
+from src.util.math import get_collided_below, move_rect_swept
+from src.util.state import ActionStateRandomizer
+
+FLAGS = flags.FLAGS
+
+
+def create_scattered_platforms(count: int, seed: int = 0) -> list[Platform]:
+    rng = random.Random(seed)
+    return [
+        Platform(
+            rel_x=rng.uniform(0.0, 0.95),
+            rel_y=rng.uniform(0.2, 0.95),
+            rel_width=rng.uniform(0.02, 0.08),
+            rel_height=0.02,
+        )
+        for _ in range(count)
+    ]
+
+
+def simulate(asset: dict, platforms: int, players: int, ticks: int, hashed: bool):
+    random.seed(0)
+    delta = FLAGS.game.clock.tick_delta
+    sheets = [asset["green-slime"], asset["blue-slime"]]
+
+    stage = create_scattered_platforms(count=platforms)
+    bodies = [
+        Player(sheet=sheets[idx % 2], rel_x=(idx + 0.5) / players)
+        for idx in range(players)
+    ]
+    bots = [ActionStateRandomizer() for _ in bodies]
+
+    if hashed:
+        world = CollisionWorld()
+        world.add_static(*stage)
+        world.add_dynamic(*bodies)
+        collisions = [world.view(owner=body) for body in bodies]
+    else:
+        world = None
+        collisions = [
+            Group(stage, [other for other in bodies if other is not body])
+            for body in bodies
+        ]
+
+    def run():
+        for _ in range(ticks):
+            for idx, body in enumerate(bodies):
+                opponent = bodies[(idx + 1) % players]
+                actions = bots[idx].get_random_actions(player=opponent, computer=body)
+                body.receive_actions(actions=actions)
+                body.update(delta=delta, collisions=collisions[idx])
+                if world is not None:
+                    world.update(sprite=body)
+
+    return run, bodies
+
+
+def benchmark_queries(platforms: int, repeat: int, queries: int):
+    """Platforms are spread over a stage that grows with them, so the
+    local density stays the same while the total count changes."""
+    rng = random.Random(1)
+    stage_width = platforms * 160
+    stage = create_scattered_platforms(count=platforms)
+    for platform in stage:
+        platform.rect.x = rng.randrange(0, stage_width)
+
+    rects = [
+        Rect(rng.randrange(0, stage_width), rng.randrange(0, 640), 80, 84)
+        for _ in range(queries)
+    ]
+
+    world = CollisionWorld()
+    world.add_static(*stage)
+    group = Group(stage)
+
+    def linear_scan():
+        for rect in rects:
+            get_collided_below(rect=rect, collisions=group)
+
+    def hashed_query():
+        view = world.view(owner=None)
+        for rect in rects:
+            get_collided_below(rect=rect, collisions=view)
+
+    print(f"{queries} get_collided_below queries, {platforms} platforms")
+    print_timings(title="linear Group scan", timings=time_call(linear_scan, repeat))
+    print_timings(title="spatial hash", timings=time_call(hashed_query, repeat))
+
+
+def benchmark_idle(asset: dict, platforms: int, players: int, repeat: int, ticks: int):
+    delta = FLAGS.game.clock.tick_delta
+    sheets = [asset["green-slime"], asset["blue-slime"]]
+    stage = create_scattered_platforms(count=platforms)
+
+    print(f"{players} idle players, {platforms} platforms, {ticks} ticks")
+    original_resting = FLAGS.game.collision.resting
+    try:
+        for resting in (False, True):
+            FLAGS.game.collision.resting = resting
+            bodies = [
+                Player(sheet=sheets[idx % 2], rel_x=(idx + 0.5) / players)
+                for idx in range(players)
+            ]
+
+            world = CollisionWorld()
+            world.add_static(*stage)
+            world.add_dynamic(*bodies)
+            views = [world.view(owner=body) for body in bodies]
+
+            def run():
+                for _ in range(ticks):
+                    for body, view in zip(bodies, views):
+                        body.update(delta=delta, collisions=view)
+                        world.update(sprite=body)
+
+            run()  # Let everyone land on a platform first
+            timings = time_call(function=run, repeat=repeat)
+            print_timings(title=f"resting contact cache={resting}", timings=timings)
+    finally:
+        FLAGS.game.collision.resting = original_resting
+
+
+def crosses_wall(rect: Rect, wall: Platform, step: int, swept: bool) -> bool:
+    """Steps rect towards the wall until blocked, True if it ends past it."""
+    rect = rect.copy()
+    collisions = Group(wall)
+    for _ in range(wall.rect.right // step + 1):
+        if swept:
+            if move_rect_swept(rect=rect, dx=step, dy=0, collisions=collisions):
+                return False
+        else:
+            moved = rect.move(step, 0)
+            if moved.colliderect(wall.rect):
+                return False
+            rect = moved
+    return rect.left >= wall.rect.right
+
+
+def benchmark_tunneling(tick_rates: list[int], seconds: float = 60.0):
+    """A dash against a thin wall, and the cost of simulating a match."""
+    speed = 1_000
+    wall = Platform(rel_x=0.5, rel_y=0.0, rel_width=0.005, rel_height=1.0)
+    rect = Rect(wall.rect.x - 101, 300, 20, 84)
+
+    original_rate = FLAGS.game.clock.tick_rate
+    try:
+        for tick_rate in tick_rates:
+            step = speed // tick_rate
+            discrete = crosses_wall(rect=rect, wall=wall, step=step, swept=False)
+            swept = crosses_wall(rect=rect, wall=wall, step=step, swept=True)
+
+            print(
+                f"{tick_rate:3d} ticks/s, {step:3d} px dash step"
+                f" | tunnels: destination test {discrete}, swept {swept}"
+            )
+
+            FLAGS.game.clock.tick_rate = tick_rate
+            env = HeadlessEnvironment(seed=0)
+            env.start(ticks=int(seconds * tick_rate))
+    finally:
+        FLAGS.game.clock.tick_rate = original_rate
+
+
+def benchmark_collision(
+    repeat: int = 3, ticks: int = 300, stages: list[tuple[int, int]] = None
+):
+    init_headless_display()
+    asset = get_assets()
+
+    if stages is None:
+        stages = [(4, 2), (100, 8), (400, 8), (400, 16)]
+
+    for platforms in (10, 100, 1_000):
+        benchmark_queries(platforms=platforms, repeat=repeat, queries=10_000)
+    print()
+
+    benchmark_idle(asset=asset, platforms=400, players=16, repeat=repeat, ticks=ticks)
+    print()
+
+    benchmark_tunneling(tick_rates=[60, 30, 15])
+    print()
+
+    for platforms, players in stages:
+        print(f"{platforms} platforms, {players} players, {ticks} ticks")
+        results = {}
+        for hashed in (False, True):
+            label = "spatial hash" if hashed else "linear Group scan"
+
+            def setup():
+                run, bodies = simulate(
+                    asset=asset,
+                    platforms=platforms,
+                    players=players,
+                    ticks=ticks,
+                    hashed=hashed,
+                )
+                results[hashed] = (run, bodies)
+
+            timings = time_call(
+                function=lambda: results[hashed][0](), repeat=repeat, setup=setup
+            )
+            print_timings(title=label, timings=timings)
+
+        linear = [tuple(body.rect) for body in results[False][1]]
+        hashed = [tuple(body.rect) for body in results[True][1]]
+        print(f"{'same final positions':<36} {linear == hashed}")
@@ -0,0 +1,31 @@
+import statistics
+import time
+from typing import *
+
+from absl import flags
+
+FLAGS = flags.FLAGS
+
+
+def time_call(
+    function: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def print_timings(title: str, timings: list[float], unit: float = 1_000):
+    label = "ms" if unit == 1_000 else "us"
+    median = statistics.median(timings) * unit
+    best = min(timings) * unit
+    print(f"{title:<36} median {median:10.3f} {label} | best {best:10.3f} {label}")
@@ -0,0 +1,26 @@
+from absl import flags
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.cluster.player import Player
+from src.headless import init_headless_display
+
+FLAGS = flags.FLAGS
+
+
+def benchmark_draw(repeat: int = 7, draws: int = 2_000):
+    screen = init_headless_display()
+    asset = get_assets()
+    player = Player(sheet=asset["green-slime"], rel_x=0.5)
+
+    def draw_player():
+        for _ in range(draws):
+            player.draw(surface=screen)
+
+    print(f"Player.draw x{draws}")
+    for hz_flip in (False, True):
+        player.animations.hz_flip = hz_flip
+        draw_player()  # Warm up, builds mirrored frames on first use
+
+        timings = time_call(function=draw_player, repeat=repeat)
+        print_timings(title=f"hz_flip={hz_flip}", timings=timings)
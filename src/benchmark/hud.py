@@ -0,0 +1,70 @@
+from absl import flags
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.cluster.player import Player
+from src.headless import init_headless_display
+from src.util.logger import TextLogger
+from src.util.state import ActionState
+
+FLAGS = flags.FLAGS
+
+
+def log_frame(text_logger: TextLogger, actions: ActionState, player: Player):
+    actions.text_log(text_logger=text_logger)
+    text_logger.add_empty()
+    player.text_log(text_logger=text_logger)
+
+
+def benchmark_hud(repeat: int = 7, frames: int = 1_000):
+    screen = init_headless_display()
+    asset = get_assets()
+
+    text_logger = TextLogger(
+        size=16, rel_x=0.02, rel_y=0.615, rel_nline=0.03, rel_col=0.192
+    )
+    ActionState.preload(text_logger=text_logger)
+    Player.preload(text_logger=text_logger)
+    player = Player(sheet=asset["green-slime"], rel_x=0.5)
+
+    steady = ActionState(source="Keyboard")
+    moving = ActionState(source="Keyboard")
+    moving.move_left = 1
+
+    def draw_rows():
+        """Every row blitted on its own, like the HUD before the layer."""
+        for _ in range(frames):
+            log_frame(text_logger=text_logger, actions=steady, player=player)
+            for coord, font_surface in text_logger.to_display:
+                if font_surface is not None:
+                    screen.blit(source=font_surface, dest=coord)
+            text_logger.to_display = []
+
+    def draw_steady():
+        for _ in range(frames):
+            log_frame(text_logger=text_logger, actions=steady, player=player)
+            text_logger.draw(surface=screen)
+
+    def draw_changing():
+        for frame in range(frames):
+            actions = moving if frame % 2 else steady
+            log_frame(text_logger=text_logger, actions=actions, player=player)
+            text_logger.draw(surface=screen)
+
+    log_frame(text_logger=text_logger, actions=steady, player=player)
+    rows = sum(font_surface is not None for _, font_surface in text_logger.to_display)
+    text_logger.to_display = []
+
+    print(f"HUD of {rows} rows, {frames} frames")
+    print_timings(
+        title="one blit per row",
+        timings=time_call(function=draw_rows, repeat=repeat),
+    )
+    print_timings(
+        title="cached layer, steady values",
+        timings=time_call(function=draw_steady, repeat=repeat),
+    )
+    print_timings(
+        title="cached layer, a row changes per frame",
+        timings=time_call(function=draw_changing, repeat=repeat),
+    )
@@ -0,0 +1,84 @@
+import random
+
+from absl import flags
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.cluster.platform import create_test_platforms
+from src.cluster.player import Player
+from src.headless import init_headless_display
+from src.util.collision import CollisionWorld
+from src.util.state import ActionState
+
+FLAGS = flags.FLAGS
+
+
+def get_scripted_actions(rng: random.Random, ticks: int) -> list[ActionState]:
+    """Held movement and defend with occasional jump and dash presses, some
+    of the dashes without a direction held."""
+    scripted = []
+    direction = 0
+    defend = 0
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            direction = rng.choice([-1, 0, 1])
+        if rng.random() < 0.02:
+            defend = 1 - defend
+
+        actions = ActionState(source="Scripted")
+        actions.move_left = int(direction < 0)
+        actions.move_right = int(direction > 0)
+        actions.defend = defend
+        actions.jump_up = int(rng.random() < 0.03)
+        actions.dash = int(rng.random() < 0.02)
+        scripted.append(actions)
+    return scripted
+
+
+def create_swarm(asset: dict, size: int, seed: int = 0) -> list[Player]:
+    """Spawned close together, so players land on and push into each other."""
+    rng = random.Random(seed)
+    sheets = [asset["green-slime"], asset["blue-slime"]]
+    return [
+        Player(sheet=sheets[idx % 2], rel_x=rng.uniform(0.3, 0.7))
+        for idx in range(size)
+    ]
+
+
+def benchmark_physics(repeat: int = 3, ticks: int = 60, sizes: list[int] = None):
+    """Movement, jumping, dashing and gravity of a swarm, players colliding
+    with the platforms and with each other."""
+    init_headless_display()
+    asset = get_assets()
+    delta = FLAGS.game.clock.tick_delta
+
+    if sizes is None:
+        sizes = [2, 100, 500]
+
+    for size in sizes:
+        print(f"{size} players, {ticks} ticks")
+        rng = random.Random(size)
+        scripted = get_scripted_actions(rng=rng, ticks=ticks)
+        players = create_swarm(asset=asset, size=size, seed=size)
+
+        world = CollisionWorld()
+        world.add_static(*create_test_platforms())
+        world.add_dynamic(*players)
+        views = [world.view(owner=player) for player in players]
+
+        def run():
+            for tick in range(ticks):
+                for idx, (player, view) in enumerate(zip(players, views)):
+                    # Out of step, so players do not all press at once
+                    actions = scripted[(tick + idx * 7) % ticks]
+                    player.receive_actions(actions=actions)
+                    player.update(delta=delta, collisions=view)
+                    world.update(sprite=player)
+
+        timings = time_call(function=run, repeat=repeat)
+        print_timings(title="Player.update", timings=timings)
+        print_timings(
+            title="Player.update per player",
+            timings=[timing / size for timing in timings],
+            unit=1_000_000,
+        )
@@ -0,0 +1,44 @@
+from absl import flags
+
+from src.benchmark.common import print_timings, time_call
+from src.util.profiler import FrameProfiler
+
+FLAGS = flags.FLAGS
+
+PHASES = ["tick", "events", "input", "update", "log", "background", "draw", "hud"]
+
+
+def run_frames(profiler: FrameProfiler, frames: int):
+    """An empty game loop, only the profiler's own cost is left."""
+    for _ in range(frames):
+        profiler.start_frame()
+        for phase in PHASES:
+            profiler.lap(phase)
+        profiler.finish_frame()
+
+
+def benchmark_profiler(repeat: int = 7, frames: int = 10_000):
+    disabled = FrameProfiler(phases=PHASES, enabled=False)
+    enabled = FrameProfiler(phases=PHASES, enabled=True)
+
+    print(f"{frames} frames of {len(PHASES)} phases")
+    timings = time_call(
+        function=lambda: run_frames(profiler=disabled, frames=frames), repeat=repeat
+    )
+    print_timings(
+        title="disabled, per frame",
+        timings=[timing / frames for timing in timings],
+        unit=1_000_000,
+    )
+    timings = time_call(
+        function=lambda: run_frames(profiler=enabled, frames=frames), repeat=repeat
+    )
+    print_timings(
+        title="enabled, per frame",
+        timings=[timing / frames for timing in timings],
+        unit=1_000_000,
+    )
+    print_timings(
+        title="summary of the ring buffers",
+        timings=time_call(function=enabled.get_summary, repeat=repeat),
+    )
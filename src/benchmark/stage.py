@@ -0,0 +1,112 @@
+from absl import flags
+from pygame import Rect
+
+from src.benchmark.camera import create_scrolling_platforms
+from src.benchmark.common import print_timings, time_call
+from src.cluster.stage import Stage, load_stage
+from src.headless import init_headless_display
+from src.util.camera import Camera
+from src.util.image import get_surface
+
+FLAGS = flags.FLAGS
+
+
+def benchmark_stage(repeat: int = 5, screens: int = 16, frames: int = 120):
+    screen = init_headless_display()
+
+    original_width = FLAGS.game.stage.width
+    try:
+        FLAGS.game.stage.width = FLAGS.game.window.width * screens
+        platforms = create_scrolling_platforms(screens=screens)
+        stage = Stage.from_platforms(platforms=platforms)
+        camera = Camera()
+    finally:
+        FLAGS.game.stage.width = original_width
+
+    step = (camera.stage.width - camera.view.width) // frames
+    views = [camera.view.width // 2 + step * frame for frame in range(frames)]
+
+    def draw_platforms():
+        for x in views:
+            camera.look_at(x=x, y=camera.stage.centery)
+            for land in camera.cull(sprites=platforms):
+                land.show_bounds(surface=screen, camera=camera)
+
+    def draw_stage():
+        for x in views:
+            camera.look_at(x=x, y=camera.stage.centery)
+            stage.draw_bounds(surface=screen, camera=camera)
+
+    print(
+        f"Scrolling stage, {screens} windows wide, {len(platforms)} platforms, "
+        "no tile layers"
+    )
+    print_timings(
+        title="Platform.show_bounds per platform",
+        timings=time_call(function=draw_platforms, repeat=repeat),
+    )
+    print_timings(
+        title="Stage.draw_bounds",
+        timings=time_call(function=draw_stage, repeat=repeat),
+    )
+
+    tiled = load_stage(filepath=FLAGS.game.path.stage["scrolling-stage"])
+    print(
+        f"scrolling-stage: {tiled.rect.width}x{tiled.rect.height} px, "
+        f"{len(tiled.platforms)} collision rects"
+    )
+    print_timings(
+        title="bake every chunk",
+        timings=time_call(
+            function=tiled.bake,
+            repeat=repeat,
+            setup=lambda: tiled.invalidate(rect=tiled.rect),
+        ),
+    )
+
+    tiled_camera = Camera(stage=tiled.rect)
+    tiled_step = (tiled.rect.width - tiled_camera.view.width) // frames
+    tiled_views = [
+        tiled_camera.view.width // 2 + tiled_step * frame for frame in range(frames)
+    ]
+    size = tiled.tile_size
+    tile_surfaces = [
+        get_surface(rect=Rect(0, 0, size, size), color=color) for color in tiled.palette
+    ]
+
+    def draw_tiles():
+        for x in tiled_views:
+            tiled_camera.look_at(x=x, y=tiled.rect.centery)
+            view = tiled_camera.view
+            left, right = view.left // size, view.right // size + 1
+            for tiles in tiled.layers.values():
+                window = tiles[:, left:right]
+                for row, col in zip(*window.nonzero()):
+                    tiled_camera.blit(
+                        surface=screen,
+                        source=tile_surfaces[window[row, col]],
+                        topleft=((left + col) * size, row * size),
+                    )
+
+    def draw_tiled_stage():
+        for x in tiled_views:
+            tiled_camera.look_at(x=x, y=tiled.rect.centery)
+            tiled.draw(surface=screen, camera=tiled_camera)
+
+    print_timings(
+        title="one blit per tile",
+        timings=time_call(function=draw_tiles, repeat=repeat),
+    )
+    print_timings(
+        title="Stage.draw, chunk blits",
+        timings=time_call(function=draw_tiled_stage, repeat=repeat),
+    )
+
+    def toggle_tile():
+        tile = tiled.layers["decor"][0, 0]
+        tiled.set_tile(layer="decor", col=0, row=0, tile=1 - tile)
+
+    print_timings(
+        title="bake after a tile changed",
+        timings=time_call(function=tiled.bake, repeat=repeat, setup=toggle_tile),
+    )
@@ -0,0 +1,53 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from absl import flags
+
+from src.asset import get_assets
+from src.benchmark.common import print_timings, time_call
+from src.headless import init_headless_display
+from src.sprite.sheet import Spritesheet
+from src.sprite.store import FRAME_STORE
+from src.util.types import SpritesheetDict
+
+FLAGS = flags.FLAGS
+
+
+def load_spritesheets(players: int):
+    FRAME_STORE.clear()
+    asset = get_assets()
+    sheets = [value for value in asset.values() if isinstance(value, SpritesheetDict)]
+    for _ in range(players):
+        for sheet in sheets:
+            Spritesheet(spritesheet=sheet)
+
+
+def benchmark_startup(repeat: int = 5, players: int = 8):
+    init_headless_display()
+
+    original_cache = FLAGS.game.cache.frames
+    cache_dir = Path(tempfile.mkdtemp(prefix="frames-"))
+    FLAGS.game.cache.frames = str(cache_dir)
+
+    def clear_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    try:
+        print(f"Startup: get_assets() + Spritesheet x{players} per sheet")
+        cold = time_call(
+            function=lambda: load_spritesheets(players=players),
+            repeat=repeat,
+            setup=clear_cache,
+        )
+        print_timings(title="cold (empty frames cache)", timings=cold)
+
+        load_spritesheets(players=players)
+        warm = time_call(
+            function=lambda: load_spritesheets(players=players), repeat=repeat
+        )
+        print_timings(title="warm (frames cache on disk)", timings=warm)
+        print(FRAME_STORE.report())
+    finally:
+        clear_cache()
+        FLAGS.game.cache.frames = original_cache
@@ -0,0 +1,106 @@
+import numpy as np
+import pygame
+from absl import flags
+
+from src.benchmark.common import print_timings, time_call
+from src.headless import init_headless_display
+from src.util.text import (
+    TEXT_CACHE,
+    TextCache,
+    blit_text_shadowed,
+    get_glyph_atlas,
+    render_bitmap,
+    render_shadowed_bitmap,
+)
+
+FLAGS = flags.FLAGS
+
+
+def get_live_strings(count: int) -> list[str]:
+    """Readouts that change every frame, nothing to preload."""
+    return [
+        f"FPS: {60 - idx % 7} | tick {idx * 0.0167:.4f}s | x: {idx % 1280} y: {idx % 720}"
+        for idx in range(count)
+    ]
+
+
+def benchmark_text(repeat: int = 7, strings: int = 1_000):
+    screen = init_headless_display()
+    atlas = get_glyph_atlas(name="JetBrainsMono-Bold", size=16)
+    font = atlas.font
+    texts = get_live_strings(count=strings)
+
+    largest = 0
+    for text in texts[:50]:
+        rendered = pygame.surfarray.array_alpha(render_bitmap(font=font, text=text))
+        composed = pygame.surfarray.array_alpha(atlas.render(text=text))
+        if rendered.shape != composed.shape:
+            largest = 255
+            break
+        largest = max(largest, int(np.abs(rendered.astype(int) - composed).max()))
+
+    def render_font():
+        for text in texts:
+            screen.blit(render_bitmap(font=font, text=text), (0, 0))
+
+    def render_atlas():
+        for text in texts:
+            screen.blit(atlas.render(text=text), (0, 0))
+
+    def draw_atlas():
+        for text in texts:
+            atlas.draw(surface=screen, text=text, dest=(0, 0))
+
+    print(f"{strings} live strings of ~{len(texts[0])} characters")
+    print_timings(
+        title="font.render and blit",
+        timings=time_call(function=render_font, repeat=repeat),
+    )
+    print_timings(
+        title="GlyphAtlas.render and blit",
+        timings=time_call(function=render_atlas, repeat=repeat),
+    )
+    print_timings(
+        title="GlyphAtlas.draw, glyph blits",
+        timings=time_call(function=draw_atlas, repeat=repeat),
+    )
+    print(f"{'largest alpha difference':<36} {largest}")
+
+    # A menu or scoreboard, the same few lines every frame
+    menu = texts[:40]
+
+    def render_shadowed():
+        for idx, text in enumerate(menu):
+            shadow = render_bitmap(font=font, text=text, color=(0, 0, 0))
+            screen.blit(shadow, (1, idx * 18 + 1))
+            screen.blit(render_bitmap(font=font, text=text), (0, idx * 18))
+
+    def draw_shadowed():
+        for idx, text in enumerate(menu):
+            blit_text_shadowed(
+                text=text, font=font, coord=(0, idx * 18), surface=screen
+            )
+
+    print(f"{len(menu)} shadowed menu lines per frame")
+    print_timings(
+        title="two font.render and blits",
+        timings=time_call(function=render_shadowed, repeat=repeat),
+    )
+    TEXT_CACHE.clear()
+    print_timings(
+        title="blit_text_shadowed, cached",
+        timings=time_call(function=draw_shadowed, repeat=repeat),
+    )
+    print(TEXT_CACHE.report())
+
+    # Live strings never repeat, the cap keeps them from piling up
+    nbytes = TextCache.get_nbytes(
+        surface=render_shadowed_bitmap(text=texts[0], font=font)
+    )
+    capped = TextCache(max_nbytes=nbytes * 100)
+    for text in texts:
+        capped.get(
+            key=("shadowed", font, text),
+            create=lambda: render_shadowed_bitmap(text=text, font=font),
+        )
+    print(capped.report())
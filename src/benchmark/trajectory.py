@@ -0,0 +1,57 @@
+import random
+
+from absl import flags
+
+from src.benchmark.common import print_timings, time_call
+from src.util.trajectory import create_jump_trajectory, get_jump_offset
+
+FLAGS = flags.FLAGS
+
+
+def benchmark_trajectory(
+    repeat: int = 5, duration: float = 0.7, length: float = 200, jumps: int = 1_000
+):
+    tick_rate = FLAGS.game.clock.tick_rate
+    delta = 1 / tick_rate
+    trajectory = create_jump_trajectory(
+        duration=duration, length=length, tick_rate=tick_rate
+    )
+
+    # A fixed timestep accumulates the same delta, cancelled jumps restart
+    # from arbitrary times in between ticks
+    ticks = int(duration / delta) + 1
+    rng = random.Random(0)
+    on_tick = []
+    for _ in range(jumps):
+        time = 0.0
+        for _ in range(ticks):
+            time += delta
+            on_tick.append(time)
+    between = [rng.uniform(0.0, duration) for _ in on_tick]
+
+    def analytic(times: list[float]):
+        for time in times:
+            get_jump_offset(time=time, duration=duration, length=length)
+
+    def lookup(times: list[float]):
+        for time in times:
+            trajectory.get_offset(time=time)
+
+    print(f"{len(on_tick)} jump offsets, {len(trajectory.offsets)} samples")
+    for label, times in (("on ticks", on_tick), ("between ticks", between)):
+        error = max(
+            abs(
+                trajectory.get_offset(time=time)
+                - get_jump_offset(time=time, duration=duration, length=length)
+            )
+            for time in times
+        )
+        print_timings(
+            title=f"analytic, {label}",
+            timings=time_call(function=lambda: analytic(times), repeat=repeat),
+        )
+        print_timings(
+            title=f"table lookup, {label}",
+            timings=time_call(function=lambda: lookup(times), repeat=repeat),
+        )
+        print(f"{'max difference':<36} {error:.4f} px")
@@ -1,8 +1,12 @@
+from functools import cached_property
+from typing import *
+
 from absl import flags
 from pygame import Rect
-from pygame.sprite import Sprite
+from pygame.sprite import Group, Sprite
 from pygame.surface import Surface
 
+from src.util.camera import Camera, blit_in_view
 from src.util.image import get_surface
 from src.util.logger import TextLogger
 
@@ -11,8 +15,8 @@ FLAGS = flags.FLAGS
 
 class Platform(Sprite):
     """
-    Subjected to change, needs to adapt the Bound class, and also needs
-    to have an image generated from chunks
+    Subjected to change, needs to adapt the Bound class. A Stage collides
+    with the platforms it is given and draws their bounds for debugging.
     """
 
     def __init__(
@@ -27,26 +31,58 @@ class Platform(Sprite):
 
         self.attributes = set()
 
-        x = int(rel_x * FLAGS.game.window.width)
-        y = int(rel_y * FLAGS.game.window.height)
-        width = int(rel_width * FLAGS.game.window.width)
-        height = int(rel_height * FLAGS.game.window.height)
+        x = int(rel_x * FLAGS.game.stage.width)
+        y = int(rel_y * FLAGS.game.stage.height)
+        width = int(rel_width * FLAGS.game.stage.width)
+        height = int(rel_height * FLAGS.game.stage.height)
 
         self.rect = Rect(x, y, width, height)
         self.color = (255, 255, 255, 64)
         self.disable_debug = disable_debug
 
+    @classmethod
+    def from_rect(cls, rect: Rect, disable_debug: bool = False) -> "Platform":
+        """Stage pixels instead of relative positions."""
+        platform = cls(
+            rel_x=0.0,
+            rel_y=0.0,
+            rel_width=0.0,
+            rel_height=0.0,
+            disable_debug=disable_debug,
+        )
+        platform.rect = Rect(rect)
+        return platform
+
     @staticmethod
     def preload(text_logger: TextLogger):
         ...
 
-    @property
+    @cached_property
     def image(self) -> Surface:
         return get_surface(rect=self.rect, color=self.color)
 
-    def show_bounds(self, surface: Surface):
-        if not self.disable_debug:
-            surface.blit(self.image, self.rect.topleft)
+    def show_bounds(
+        self, surface: Surface, camera: Optional[Camera] = None
+    ) -> Optional[Rect]:
+        if self.disable_debug:
+            return None
+        if camera is not None and not camera.is_visible(self.rect):
+            return None
+
+        return blit_in_view(
+            surface=surface, source=self.image, topleft=self.rect.topleft, camera=camera
+        )
 
     def __str__(self) -> str:
         return super().__str__() + str(self.rect)
+
+
+def create_test_platforms() -> Group:
+    platform_1 = Platform(
+        rel_x=0.0, rel_y=0.55, rel_width=1.0, rel_height=0.5, disable_debug=True
+    )
+    platform_2 = Platform(rel_x=0.335, rel_y=0.36, rel_width=0.3282, rel_height=0.063)
+    platform_3 = Platform(rel_x=0.069, rel_y=0.205, rel_width=0.207, rel_height=0.063)
+    platform_4 = Platform(rel_x=0.725, rel_y=0.205, rel_width=0.207, rel_height=0.063)
+
+    return Group(platform_1, platform_2, platform_3, platform_4)
@@ -2,22 +2,25 @@ from typing import *
 
 from absl import flags
 from pygame import Rect
+from pygame.mask import Mask
 from pygame.sprite import Sprite
 from pygame.surface import Surface
 
-from src.ability.attack import AttackSequence
+from src.ability.attack import ATTACK_SLICE, AttackSequence
 from src.ability.dash import DashSequence
 from src.ability.jump import JumpSequence
 from src.ability.motion import Motion
 from src.sprite.bound import Bound, HitboxRelPos, WindowRelPos
 from src.sprite.sheet import Spritesheet
+from src.util.camera import Camera
+from src.util.collision import Collisions
 from src.util.input import is_new_only, is_old_only
 from src.util.logger import TextLogger
 from src.util.math import (
     add_vector_to_rect,
-    contain_rect_in_window,
-    get_collided,
-    get_collided_below,
+    contain_rect_in_stage,
+    get_stage_bounds,
+    move_rect_swept,
     place_rect_on_top,
 )
 from src.util.state import ActionState
@@ -34,6 +37,9 @@ class Player(Sprite):
 
         self.attributes = {Attribute.Health, Attribute.Motion}
         self.status_effects = set()
+        self.support: Optional[Sprite] = None
+        self.resting_contact: bool = FLAGS.game.collision.resting
+        self.masks: bool = FLAGS.game.collision.masks
 
         self.action = ActionState(source="<None>")
         self.animations = Spritesheet(spritesheet=sheet)
@@ -57,6 +63,13 @@ class Player(Sprite):
             self.animations.hz_flip = True
             self.motion.last_facing = Motion.LEFT
 
+        # Reused every tick instead of allocating new rects
+        self.stage_bounds = get_stage_bounds()
+        self.scratch_rect = self.rect.copy()
+        self.slice_rect = Rect(0, 0, 0, 0)
+        self.bound.align_rects()
+        self.previous_rect = self.bound.image_rect.copy()
+
     @staticmethod
     def preload(text_logger: TextLogger):
         text_logger.preload("Status")
@@ -127,22 +140,26 @@ class Player(Sprite):
 
         self.action = actions
 
-    def apply_movement(self, delta: float, collisions: list[Sprite]):
+    def apply_movement(self, delta: float, collisions: Collisions):
         if self.action.is_moving:
             self.animations.hz_flip = not self.motion.right_turn
 
-            new_rect = self.rect.copy()
+            new_rect = self.scratch_rect
+            new_rect.update(self.rect)
             movement = self.motion.get_move(delta=delta, action_state=self.action)
             add_vector_to_rect(rect=new_rect, vector=movement)
-            contain_rect_in_window(rect=new_rect)
-            if get_collided(rect=new_rect, collisions=collisions) is not None:
-                return None
+            contain_rect_in_stage(rect=new_rect, bounds=self.stage_bounds)
 
-            self.rect = new_rect
+            rect = self.rect
+            move_rect_swept(
+                rect=rect,
+                dx=new_rect.x - rect.x,
+                dy=new_rect.y - rect.y,
+                collisions=collisions,
+            )
 
-    def apply_jump(self, delta: float, collisions: list[Sprite]):
+    def apply_jump(self, delta: float, collisions: Collisions):
         self.jump.update(player_rect=self.rect, delta=delta, collisions=collisions)
-        self.bound.align_rects()
 
         if not self.animations.is_performing:
             if self.jump.status == JumpSequence.RISING:
@@ -152,33 +169,59 @@ class Player(Sprite):
             else:
                 self.animations.update_idle(new="idle")
 
-    def apply_dash(self, delta: float, collisions: list[Sprite]):
+    def apply_dash(self, delta: float, collisions: Collisions):
         self.dash.update(player_rect=self.rect, delta=delta, collisions=collisions)
-        self.bound.align_rects()
 
         if not self.dash.is_dashing:
             self.del_status_effects(self.dash.status_effects)
             self.animations.reset_perf()
             self.motion.move_lock = None
 
-    def apply_gravity(self, delta: float, collisions: list[Sprite]):
+    def is_resting(self, collisions: Collisions) -> bool:
+        """Still standing on the same support, no need to apply gravity."""
+        support = self.support
+        if support is None or not self.resting_contact:
+            return False
+
+        rect = self.rect
+        below = support.rect
+        if rect.bottom != below.top:
+            return False
+        if rect.right <= below.left or rect.left >= below.right:
+            return False
+
+        return support in collisions
+
+    def apply_gravity(self, delta: float, collisions: Collisions):
+        if self.is_resting(collisions=collisions):
+            self.animations.update_idle(new="idle")
+            self.motion.on_ground = True
+            return None
+
+        new_rect = self.scratch_rect
+        new_rect.update(self.rect)
         descend = self.motion.get_descend(delta=delta)
-        add_vector_to_rect(rect=self.rect, vector=descend)
+        add_vector_to_rect(rect=new_rect, vector=descend)
 
-        if collision := get_collided_below(rect=self.rect, collisions=collisions):
-            place_rect_on_top(top=self.rect, bottom=collision.rect)
+        rect = self.rect
+        contact = move_rect_swept(
+            rect=rect, dx=0, dy=new_rect.y - rect.y, collisions=collisions
+        )
+        if contact is not None:
+            # Also lifts out of a sprite it was already overlapping
+            place_rect_on_top(top=rect, bottom=contact.sprite.rect)
             self.animations.update_idle(new="idle")
             self.motion.on_ground = True
+            self.support = contact.sprite
         else:
             self.animations.update_idle(new="fall")
             self.motion.on_ground = False
+            self.support = None
 
-        self.bound.align_rects()
-
-    def apply_attack(self, delta: float, collisions: list[Sprite]):
-        self.attack.update(delta=delta, collisions=collisions)
+    def apply_attack(self, delta: float):
+        self.attack.update(delta=delta)
 
-    def update(self, delta: float, collisions: list[Sprite]):
+    def update(self, delta: float, collisions: Collisions):
         """Movement is the first priority."""
         self.apply_movement(delta=delta, collisions=collisions)
 
@@ -198,25 +241,86 @@ class Player(Sprite):
             self.apply_gravity(delta=delta, collisions=collisions)
 
         """Performing Actions such as attacks, defend and skills."""
-        self.attack.update_requirements(
-            player_rect=self.rect, right_turn=self.motion.right_turn
-        )
         if self.attack.is_attacking:
-            self.apply_attack(delta=delta, collisions=collisions)
+            self.apply_attack(delta=delta)
         self.attack.debug_update(delta=delta)
 
-        """Lastly is the animation"""
+        """Lastly is the animation, the attack follows the frame now shown"""
         self.animations.update(delta=delta)
+        self.attack.update_requirements(
+            player_rect=self.rect,
+            right_turn=self.motion.right_turn,
+            frame_rect=self.get_attack_slice(),
+        )
+
+    def get_attack_slice(self) -> Optional[Rect]:
+        if not self.attack.is_attacking:
+            return None
 
-    def draw(self, surface: Surface):
         sprite = self.animations.get_sprite()
-        sprite.draw(
-            surface=surface,
+        if not sprite.set_slice_rect(
+            out=self.slice_rect,
+            name=ATTACK_SLICE,
             topleft=self.bound.image_start,
             hz_flip=self.animations.hz_flip,
+        ):
+            return None
+        return self.slice_rect
+
+    def get_mask(self) -> Optional[tuple[Mask, tuple[int, int]]]:
+        """Mask of the frame currently drawn, at its screen position."""
+        if not self.masks:
+            return None
+
+        mask, offset = self.animations.get_sprite().get_mask(
+            hz_flip=self.animations.hz_flip
         )
+        x, y = self.bound.image_start
+        return mask, (x + offset[0], y + offset[1])
+
+    def save_state(self):
+        """Called before every tick, the start of the interpolated motion."""
+        self.bound.align_rects()
+        self.previous_rect.update(self.bound.image_rect)
+
+    def get_draw_start(self, alpha: float) -> tuple[int, int]:
+        x, y = self.bound.image_start
+        prev_x, prev_y = self.previous_rect.x, self.previous_rect.y
+        return (
+            round(prev_x + (x - prev_x) * alpha),
+            round(prev_y + (y - prev_y) * alpha),
+        )
+
+    def is_in_view(self, camera: Camera) -> bool:
+        """The drawn image lies somewhere between its last two positions."""
+        self.bound.align_rects()
+        return camera.is_visible(self.bound.image_rect) or camera.is_visible(
+            self.previous_rect
+        )
+
+    def draw(
+        self, surface: Surface, alpha: float = 1.0, camera: Optional[Camera] = None
+    ) -> Optional[Rect]:
+        if camera is not None and not self.is_in_view(camera=camera):
+            return None
+
+        topleft = self.get_draw_start(alpha=alpha)
+        if camera is not None:
+            topleft = camera.to_screen(topleft=topleft)
+
+        sprite = self.animations.get_sprite()
+        return sprite.draw(
+            surface=surface, topleft=topleft, hz_flip=self.animations.hz_flip
+        )
+
+    def draw_bounds(
+        self, surface: Surface, camera: Optional[Camera] = None
+    ) -> list[Optional[Rect]]:
+        if camera is not None and not self.is_in_view(camera=camera):
+            return []
+
+        dirty = [self.bound.draw(surface=surface, camera=camera)]
+        if self.attack.debug:
+            dirty.append(self.attack.draw(surface=surface, camera=camera))
 
-    def draw_bounds(self, surface: Surface):
-        self.bound.draw(surface=surface)
-        if FLAGS.game.debug.attacks:
-            self.attack.draw(surface=surface)
+        return dirty
@@ -0,0 +1,252 @@
+import math
+from typing import *
+
+import numpy as np
+from absl import flags
+from pygame import RLEACCEL, SRCALPHA, Rect
+from pygame.sprite import Group
+from pygame.surface import Surface
+
+from src.cluster.platform import Platform, create_test_platforms
+from src.util.camera import Camera, blit_in_view
+from src.util.file_io import load_stage_json
+from src.util.types import StageDict
+
+FLAGS = flags.FLAGS
+
+ChunkKey = tuple[int, int]
+
+
+def get_solid_rects(tiles: np.ndarray, tile_size: int) -> list[Rect]:
+    """
+    Runs of solid tiles per row, stacked with the identical runs of the rows
+    below, so a filled block becomes a single rect.
+    """
+    open_runs: dict[tuple[int, int], Rect] = {}
+    rects = []
+    for idx_row, row in enumerate(tiles != 0):
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], row, [0])).astype(int)))
+        runs = set(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+        for run in list(open_runs):
+            if run not in runs:
+                rects.append(open_runs.pop(run))
+        for start, stop in runs:
+            if (start, stop) in open_runs:
+                open_runs[(start, stop)].height += tile_size
+            else:
+                open_runs[(start, stop)] = Rect(
+                    start * tile_size,
+                    idx_row * tile_size,
+                    (stop - start) * tile_size,
+                    tile_size,
+                )
+
+    rects.extend(open_runs.values())
+    return rects
+
+
+class Stage:
+    """
+    Tile layers baked into fixed-size chunk surfaces, drawn with one blit per
+    visible chunk, later layers over earlier ones. A change only re-bakes the
+    chunks it touches. Platforms are collision only, their bounds are a debug
+    overlay drawn from their own cached images.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        tile_size: int = 1,
+        palette: Optional[list[tuple[int, int, int, int]]] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        self.rect = Rect(0, 0, width, height)
+        self.tile_size = tile_size
+        self.palette = [(0, 0, 0, 0)] if palette is None else palette
+        self.chunk_size = (
+            FLAGS.game.stage.chunk_size if chunk_size is None else chunk_size
+        )
+        self.columns = math.ceil(width / self.chunk_size)
+        self.rows = math.ceil(height / self.chunk_size)
+
+        self.layers: dict[str, np.ndarray] = {}
+        self.collision: list[str] = []
+        self.blocks: list[Platform] = []
+        self.tile_platforms: list[Platform] = []
+        self.platforms = Group()
+
+        # Chunks without anything drawn in them keep no surface
+        self.chunks: dict[ChunkKey, Surface] = {}
+        self.dirty: set[ChunkKey] = set()
+        self.invalidate(rect=self.rect)
+
+    @staticmethod
+    def from_dict(stage_dict: StageDict) -> "Stage":
+        height, width = 0, 0
+        for tiles in stage_dict.layers.values():
+            height = max(height, tiles.shape[0] * stage_dict.tile_size)
+            width = max(width, tiles.shape[1] * stage_dict.tile_size)
+
+        stage = Stage(
+            width=width,
+            height=height,
+            tile_size=stage_dict.tile_size,
+            palette=stage_dict.palette,
+        )
+        stage.collision = stage_dict.collision
+        for name, tiles in stage_dict.layers.items():
+            stage.add_layer(name=name, tiles=tiles)
+        return stage
+
+    @staticmethod
+    def from_platforms(platforms: Iterable[Platform]) -> "Stage":
+        """The stage of the config, baking the platforms that show bounds."""
+        stage = Stage(width=FLAGS.game.stage.width, height=FLAGS.game.stage.height)
+        stage.add_platforms(platforms=platforms)
+        return stage
+
+    def add_layer(self, name: str, tiles: np.ndarray):
+        self.layers[name] = tiles
+        self.invalidate(rect=self.rect)
+        self.build_collisions()
+
+    def add_platforms(self, platforms: Iterable[Platform]):
+        for platform in platforms:
+            self.platforms.add(platform)
+            if not platform.disable_debug:
+                self.blocks.append(platform)
+
+    def build_collisions(self):
+        """Tile platforms are replaced, re-add them to a CollisionWorld."""
+        self.platforms.remove(*self.tile_platforms)
+        self.tile_platforms = [
+            Platform.from_rect(rect=rect, disable_debug=True)
+            for name in self.collision
+            if name in self.layers
+            for rect in get_solid_rects(
+                tiles=self.layers[name], tile_size=self.tile_size
+            )
+        ]
+        self.platforms.add(*self.tile_platforms)
+
+    def set_tile(self, layer: str, col: int, row: int, tile: int):
+        tiles = self.layers[layer]
+        if tiles[row, col] == tile:
+            return None
+
+        tiles[row, col] = tile
+        size = self.tile_size
+        self.invalidate(rect=Rect(col * size, row * size, size, size))
+        if layer in self.collision:
+            self.build_collisions()
+
+    def get_chunk_keys(self, rect: Rect) -> Iterator[ChunkKey]:
+        size = self.chunk_size
+        left = max(rect.left // size, 0)
+        right = min((rect.right - 1) // size, self.columns - 1)
+        top = max(rect.top // size, 0)
+        bottom = min((rect.bottom - 1) // size, self.rows - 1)
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                yield cx, cy
+
+    def invalidate(self, rect: Rect):
+        """Marks the chunks under the rect for the next bake."""
+        self.dirty.update(self.get_chunk_keys(rect=rect))
+
+    def get_chunk_rect(self, key: ChunkKey) -> Rect:
+        size = self.chunk_size
+        return Rect(key[0] * size, key[1] * size, size, size).clip(self.rect)
+
+    def bake_chunk(self, key: ChunkKey):
+        area = self.get_chunk_rect(key=key)
+        surface = self.chunks.get(key)
+        if surface is None:
+            # Run-length encoded like get_surface, blits skip the empty runs
+            surface = Surface(area.size, flags=SRCALPHA)
+            surface.set_colorkey((0, 0, 0), RLEACCEL)
+        surface.fill((0, 0, 0, 0))
+        painted = False
+
+        size = self.tile_size
+        left, top = area.left // size, area.top // size
+        right, bottom = math.ceil(area.right / size), math.ceil(area.bottom / size)
+        for tiles in self.layers.values():
+            window = tiles[top:bottom, left:right]
+            for row, col in zip(*np.nonzero(window)):
+                tile_rect = Rect((left + col) * size, (top + row) * size, size, size)
+                surface.fill(
+                    self.palette[window[row, col]],
+                    tile_rect.clip(area).move(-area.x, -area.y),
+                )
+                painted = True
+
+        if painted:
+            self.chunks[key] = surface
+        else:
+            self.chunks.pop(key, None)
+
+    @property
+    def is_tiled(self) -> bool:
+        return bool(self.layers)
+
+    def bake(self) -> int:
+        baked = len(self.dirty)
+        for key in self.dirty:
+            self.bake_chunk(key=key)
+        self.dirty.clear()
+        return baked
+
+    def draw(
+        self, surface: Surface, camera: Optional[Camera] = None
+    ) -> list[Optional[Rect]]:
+        if not self.is_tiled:
+            return []
+
+        if self.dirty:
+            self.bake()
+
+        keys = self.chunks if camera is None else self.get_chunk_keys(camera.view)
+        dirty = []
+        for key in keys:
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                continue
+            size = self.chunk_size
+            dirty.append(
+                blit_in_view(
+                    surface=surface,
+                    source=chunk,
+                    topleft=(key[0] * size, key[1] * size),
+                    camera=camera,
+                )
+            )
+        return dirty
+
+    def draw_bounds(
+        self, surface: Surface, camera: Optional[Camera] = None
+    ) -> list[Optional[Rect]]:
+        blocks = self.blocks if camera is None else camera.cull(sprites=self.blocks)
+        return [block.show_bounds(surface=surface, camera=camera) for block in blocks]
+
+
+def load_stage(filepath: str) -> Stage:
+    return Stage.from_dict(stage_dict=load_stage_json(filepath=filepath))
+
+
+def create_stage() -> Stage:
+    """
+    The stage named by stage.name, the test platforms without one. Call it
+    before creating players, a loaded stage sets the stage size of the config
+    that bounds, cameras and relative positions are read from.
+    """
+    name = FLAGS.game.stage.name
+    if not name:
+        return Stage.from_platforms(platforms=create_test_platforms())
+
+    stage = load_stage(filepath=FLAGS.game.path.stage[name])
+    FLAGS.game.stage.width = stage.rect.width
+    FLAGS.game.stage.height = stage.rect.height
+    return stage
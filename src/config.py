@@ -1,33 +1,113 @@
+import json
+import os
 from pathlib import Path
+from typing import *
 
 from ml_collections import ConfigDict
 
+# Bump whenever the layout of the generated asset manifest changes
+MANIFEST_VERSION = 2
 
-def get_assets_paths(directory_path: Path, config: ConfigDict) -> ConfigDict:
+Manifest = dict[str, Any]
+
+
+def get_root_directory() -> Path:
+    return Path(__file__).resolve().parent.parent
+
+
+def get_manifest_path(dir_name: str) -> Path:
+    return get_root_directory() / ".cache" / f"{dir_name}-manifest.json"
+
+
+def scan_assets(directory_path: Path, manifest: Manifest) -> Manifest:
     path = Path(directory_path)
+    manifest["directories"][str(path)] = path.stat().st_mtime_ns
 
     for item in path.iterdir():
         if item.is_file():
             name = item.stem
             extension = item.suffix[1:]
 
-            if extension not in config:
-                config[extension] = ConfigDict()
-
-            config[extension][name] = str(item)
+            # Only paths, an asset edited in place keeps its path and the
+            # frames cache is keyed by content digests anyway
+            files = manifest["files"].setdefault(extension, {})
+            files[name] = {"path": str(item)}
 
         elif item.is_dir():
-            get_assets_paths(directory_path=item, config=config)
+            scan_assets(directory_path=item, manifest=manifest)
+
+    return manifest
+
+
+def is_manifest_fresh(manifest: Manifest, assets_path: Path) -> bool:
+    """
+    Adding, removing or renaming an entry bumps the mtime of its parent
+    directory, so only directories are stat'ed, never the files in them.
+    """
+    if manifest.get("version") != MANIFEST_VERSION:
+        return False
+    if manifest.get("root") != str(assets_path):
+        return False
+
+    try:
+        for directory, mtime in manifest["directories"].items():
+            if os.stat(directory).st_mtime_ns != mtime:
+                return False
+    except (OSError, KeyError):
+        return False
 
-    return config
+    return True
+
+
+def load_manifest(manifest_path: Path) -> Optional[Manifest]:
+    try:
+        with open(file=manifest_path, mode="r") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(manifest_path: Path, manifest: Manifest):
+    temp_path = manifest_path.with_suffix(".tmp")
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file=temp_path, mode="w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        print(f"{e}\nAsset manifest could not be written.")
+
+
+def get_manifest(dir_name: str) -> Manifest:
+    assets_path = get_root_directory() / dir_name
+    manifest_path = get_manifest_path(dir_name=dir_name)
+
+    manifest = load_manifest(manifest_path=manifest_path)
+    if manifest is not None and is_manifest_fresh(
+        manifest=manifest, assets_path=assets_path
+    ):
+        return manifest
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "root": str(assets_path),
+        "directories": {},
+        "files": {},
+    }
+    scan_assets(directory_path=assets_path, manifest=manifest)
+    save_manifest(manifest_path=manifest_path, manifest=manifest)
+
+    return manifest
 
 
 def get_paths(dir_name: str) -> ConfigDict:
     path = ConfigDict()
 
-    current_directory = Path(__file__).resolve().parent.parent
-    assets_path = current_directory / dir_name
-    get_assets_paths(directory_path=assets_path, config=path)
+    manifest = get_manifest(dir_name=dir_name)
+    for extension, files in manifest["files"].items():
+        path[extension] = ConfigDict()
+        for name, entry in files.items():
+            path[extension][name] = entry["path"]
 
     return path
 
@@ -37,12 +117,21 @@ def get_config() -> ConfigDict:
     c.debug = ConfigDict()
     c.path = ConfigDict()
     c.window = ConfigDict()
+    c.stage = ConfigDict()
     c.clock = ConfigDict()
     c.images = ConfigDict()
+    c.cache = ConfigDict()
+    c.render = ConfigDict()
+    c.headless = ConfigDict()
+    c.batch = ConfigDict()
+    c.collision = ConfigDict()
+    c.profiler = ConfigDict()
 
     # Debug
     c.debug.bounds = False
     c.debug.attacks = True
+    # Asset load timings and frame store memory
+    c.debug.assets = False
 
     # Paths
     c.path = get_paths(dir_name="asset")
@@ -51,13 +140,67 @@ def get_config() -> ConfigDict:
     c.window.width = 1280
     c.window.height = 720
 
+    # Stage, world coordinates, the camera scrolls over it when it is larger
+    # than the window
+    c.stage.width = 1280
+    c.stage.height = 720
+    c.stage.chunk_size = 256
+    # A stage asset such as "scrolling-stage", empty for the test platforms
+    c.stage.name = ""
+
     # Clock
     c.clock.fps = 60
     c.clock.single_frame = 1 / c.clock.fps
-    c.clock.tolerance = 1.1
-    c.clock.max_delta = c.clock.single_frame * c.clock.tolerance
+    c.clock.tick_rate = 60
+    # References, so overriding the tick rate also changes the deltas
+    c.clock.tick_delta = 1 / c.clock.get_ref("tick_rate")
+    c.clock.max_ticks = 5
+
+    # Headless
+    c.headless.ticks = 10_000
+    c.headless.delta = c.clock.get_ref("tick_delta")
+    c.headless.seed = 0
+
+    # Batch, headless matches spread over a process pool
+    c.batch.matches = 1_000
+    c.batch.ticks = 3_600
+    c.batch.seed = 0
+    # Zero uses every core
+    c.batch.workers = 0
+    c.batch.chunk_size = 10
+    c.batch.heatmap_cell = 32
+    c.batch.output = str(get_root_directory() / ".cache" / "batch.npz")
+
+    # Collision
+    c.collision.cell_size = 128
+    c.collision.resting = True
+    # Pixel masks per frame, hits must touch the target's opaque pixels
+    c.collision.masks = False
 
     # Images
     c.images.upscale = 4.0
+    c.images.load_workers = 4
+    c.images.atlas = True
+    c.images.atlas_page_size = 2048
+
+    # Render
+    c.render.dirty_rects = False
+    # Background scroll per pixel of camera movement, 0 keeps it fixed
+    c.render.parallax = 0.5
+
+    # Profiler, frame time per game loop phase
+    c.profiler.enabled = False
+    c.profiler.overlay = False
+    # Frames kept in the ring buffers
+    c.profiler.frames = 600
+    # Frames between overlay refreshes
+    c.profiler.refresh = 30
+    c.profiler.output = str(get_root_directory() / ".cache" / "profile.csv")
+
+    # Cache
+    c.cache.enabled = True
+    c.cache.frames = str(get_root_directory() / ".cache" / "frames")
+    # Rendered text held in memory, least recently used dropped first
+    c.cache.text_mib = 8.0
 
     return c
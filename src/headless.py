@@ -0,0 +1,100 @@
+import os
+import random
+import time
+from typing import *
+
+import pygame
+from absl import flags
+
+from src.ability.attack import resolve_attacks
+from src.asset import get_assets
+from src.cluster.player import Player
+from src.cluster.stage import Stage, create_stage
+from src.util.collision import CollisionWorld
+from src.util.state import ActionStateRandomizer
+
+FLAGS = flags.FLAGS
+
+
+def init_headless_display() -> pygame.Surface:
+    """Set up once, later calls reuse the display mode."""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return pygame.display.get_surface()
+
+    # Assets still need a display mode for convert_alpha, the dummy driver
+    # provides one without a window so this runs on CI and servers
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    pygame.init()
+    return pygame.display.set_mode(
+        size=(FLAGS.game.window.width, FLAGS.game.window.height)
+    )
+
+
+class HeadlessEnvironment:
+    """
+    Bot-vs-bot simulation without drawing, HUD or frame cap, stepped with a
+    fixed delta as fast as the CPU allows.
+    """
+
+    def __init__(
+        self, seed: int = 0, asset: Optional[dict] = None, stage: Optional[Stage] = None
+    ) -> None:
+        init_headless_display()
+        random.seed(seed)
+
+        # Batches pass the assets and stage in, every match in a process
+        # shares them, the stage's platforms are only read
+        self.asset = get_assets() if asset is None else asset
+        self.stage = create_stage() if stage is None else stage
+        self.delta = FLAGS.game.headless.delta
+
+        self.player_1 = Player(sheet=self.asset["green-slime"], rel_x=0.4)
+        self.player_2 = Player(
+            sheet=self.asset["blue-slime"], rel_x=0.6, face_left=True
+        )
+
+        self.world = CollisionWorld()
+        self.world.add_static(*self.stage.platforms)
+        self.world.add_dynamic(self.player_1, self.player_2)
+        self.p1_collisions = self.world.view(owner=self.player_1)
+        self.p2_collisions = self.world.view(owner=self.player_2)
+
+        self.p1_random_actions = ActionStateRandomizer()
+        self.p2_random_actions = ActionStateRandomizer()
+
+        self.ticks = 0
+
+    def step(self):
+        p1_actions = self.p1_random_actions.get_random_actions(
+            player=self.player_2, computer=self.player_1
+        )
+        p2_actions = self.p2_random_actions.get_random_actions(
+            player=self.player_1, computer=self.player_2
+        )
+        self.player_1.receive_actions(actions=p1_actions)
+        self.player_2.receive_actions(actions=p2_actions)
+
+        self.player_1.update(delta=self.delta, collisions=self.p1_collisions)
+        self.world.update(sprite=self.player_1)
+        self.player_2.update(delta=self.delta, collisions=self.p2_collisions)
+        self.world.update(sprite=self.player_2)
+        resolve_attacks(attackers=(self.player_1, self.player_2), world=self.world)
+
+        self.ticks += 1
+
+    def start(self, ticks: int) -> float:
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.step()
+        elapsed = time.perf_counter() - start
+
+        ticks_per_sec = ticks / elapsed
+        simulated = ticks * self.delta
+        print(
+            f"Headless: {ticks} ticks ({simulated:.1f}s simulated) in "
+            f"{elapsed:.2f}s | {ticks_per_sec:,.0f} ticks/s"
+        )
+
+        return ticks_per_sec
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from typing import *
+
+from absl import flags
+from pygame import SRCALPHA, transform
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from src.util.image import copy_pixels
+
+FLAGS = flags.FLAGS
+
+AtlasKey = tuple[str, str, int, bool]
+
+
+@dataclass(frozen=True)
+class AtlasRegion:
+    """A frame inside an atlas page, trimmed of its transparent border."""
+
+    page: Surface
+    area: Rect
+    offset: tuple[int, int]
+    size: tuple[int, int]
+
+    @property
+    def nbytes(self) -> int:
+        return self.page.get_bytesize() * self.area.width * self.area.height
+
+    @property
+    def frame_nbytes(self) -> int:
+        """Size of the untrimmed frame as a surface of its own."""
+        return self.page.get_bytesize() * self.size[0] * self.size[1]
+
+    def get_rect(self) -> Rect:
+        return Rect((0, 0), self.size)
+
+    def get_surface(self) -> Surface:
+        return self.page.subsurface(self.area)
+
+    def get_flipped_offset(self) -> tuple[int, int]:
+        return (self.size[0] - self.offset[0] - self.area.width, self.offset[1])
+
+
+def get_standalone_region(surface: Surface) -> AtlasRegion:
+    return AtlasRegion(
+        page=surface, area=surface.get_rect(), offset=(0, 0), size=surface.get_size()
+    )
+
+
+def get_flipped_standalone_region(region: AtlasRegion) -> AtlasRegion:
+    return get_standalone_region(surface=transform.flip(region.page, True, False))
+
+
+class TextureAtlas:
+    """
+    Shelf packer, frames are placed left to right on the current row and a
+    new row (or page) is opened once the frame does not fit anymore.
+    """
+
+    def __init__(self, page_size: int):
+        self.page_size = page_size
+        self.pages: list[Surface] = []
+        self.regions: dict[AtlasKey, AtlasRegion] = {}
+        self.standalone: list[Surface] = []
+
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+    def new_page(self):
+        page = Surface((self.page_size, self.page_size), SRCALPHA)
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+    def allocate(self, width: int, height: int) -> Optional[tuple[Surface, Rect]]:
+        if width > self.page_size or height > self.page_size:
+            return None
+
+        if not self.pages:
+            self.new_page()
+
+        if self.shelf_x + width > self.page_size:
+            self.shelf_x = 0
+            self.shelf_y += self.shelf_height
+            self.shelf_height = 0
+
+        if self.shelf_y + height > self.page_size:
+            self.new_page()
+
+        area = Rect(self.shelf_x, self.shelf_y, width, height)
+        self.shelf_x += width
+        self.shelf_height = max(self.shelf_height, height)
+
+        return self.pages[-1], area
+
+    def add(
+        self,
+        key: AtlasKey,
+        surface: Surface,
+        size: Optional[tuple[int, int]] = None,
+        offset: tuple[int, int] = (0, 0),
+    ) -> AtlasRegion:
+        trim = surface.get_bounding_rect()
+        if size is None:
+            size = surface.get_size()
+
+        allocation = self.allocate(width=trim.width, height=trim.height)
+        if allocation is None:
+            # Bigger than a page, kept as its own surface
+            self.standalone.append(surface)
+            region = AtlasRegion(
+                page=surface, area=surface.get_rect(), offset=offset, size=size
+            )
+        else:
+            page, area = allocation
+            copy_pixels(surface=page, source=surface, dest=area.topleft, area=trim)
+            trimmed_offset = (offset[0] + trim.x, offset[1] + trim.y)
+            region = AtlasRegion(page=page, area=area, offset=trimmed_offset, size=size)
+
+        self.regions[key] = region
+        return region
+
+    def add_flipped(self, key: AtlasKey, region: AtlasRegion) -> AtlasRegion:
+        flipped = transform.flip(region.get_surface(), True, False)
+        return self.add(
+            key=key,
+            surface=flipped,
+            size=region.size,
+            offset=region.get_flipped_offset(),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        pages = sum(
+            page.get_bytesize() * page.get_width() * page.get_height()
+            for page in self.pages
+        )
+        standalone = sum(
+            surface.get_bytesize() * surface.get_width() * surface.get_height()
+            for surface in self.standalone
+        )
+        return pages + standalone
+
+    @property
+    def used_nbytes(self) -> int:
+        return sum(region.nbytes for region in self.regions.values())
+
+    def report(self) -> str:
+        total = self.nbytes / 2**20
+        used = self.used_nbytes / 2**20
+        return (
+            f"Texture atlas: {len(self.pages)} page(s) of {self.page_size}px, "
+            f"{len(self.standalone)} standalone | {len(self.regions)} regions, "
+            f"allocated {total:.2f} MiB, used {used:.2f} MiB"
+        )
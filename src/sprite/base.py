@@ -1,17 +1,21 @@
-from itertools import cycle
+from array import array
 from typing import *
 
 from absl import flags
-from pygame import SRCALPHA, Vector2, transform
+from pygame import Vector2
+from pygame.mask import Mask
 from pygame.rect import Rect
 from pygame.sprite import Sprite
 from pygame.surface import Surface
 
-from src.util.image import upscale_surface
+from src.sprite.atlas import AtlasRegion
+from src.sprite.store import FRAME_STORE, FrameSet
 from src.util.types import SpritesheetDict
 
 FLAGS = flags.FLAGS
 
+SliceRects = tuple[tuple[int, int, int, int], ...]
+
 
 def get_frame_data_via_tag(spritesheet: SpritesheetDict, tag_name: str) -> dict:
     data = {}
@@ -32,6 +36,41 @@ def get_frame_data_via_tag(spritesheet: SpritesheetDict, tag_name: str) -> dict:
     return data
 
 
+def get_slice_data_via_tag(
+    spritesheet: SpritesheetDict, tag_name: Optional[str], data: dict
+) -> tuple[dict[str, SliceRects], dict[str, SliceRects]]:
+    """Slices of the tag's frames scaled like the frames, as drawn facing
+    right and facing left."""
+    start = 0
+    if tag_name is not None:
+        start = next(t["from"] for t in spritesheet.tags if t["name"] == tag_name)
+
+    scale = FLAGS.game.images.upscale
+    slices = {}
+    flipped_slices = {}
+    for name, rects in spritesheet.slices.items():
+        frame_rects = []
+        flipped_rects = []
+        for idx_ordered in data:
+            x, y, w, h = rects[start + idx_ordered].tolist()
+            frame_w = data[idx_ordered]["w"]
+            frame_rects.append(
+                (int(x * scale), int(y * scale), int(w * scale), int(h * scale))
+            )
+            flipped_rects.append(
+                (
+                    int((frame_w - x - w) * scale),
+                    int(y * scale),
+                    int(w * scale),
+                    int(h * scale),
+                )
+            )
+        slices[name] = tuple(frame_rects)
+        flipped_slices[name] = tuple(flipped_rects)
+
+    return slices, flipped_slices
+
+
 class Animation(Sprite):
     def __init__(
         self,
@@ -40,7 +79,8 @@ class Animation(Sprite):
         loops: int = -1,
     ) -> None:
         super().__init__()
-        self.spritesheet = spritesheet.image
+        self.spritesheet = spritesheet
+        self.tag_name = tag_name
 
         if tag_name is not None:
             self.data = get_frame_data_via_tag(
@@ -51,37 +91,33 @@ class Animation(Sprite):
 
         self.loops = loops  # -1 is infinite
 
-        self.frames = self.parse_frames()
+        self.frame_set = self.parse_frames()
+        self.frames = self.frame_set.frames
+        self.slices, self.flipped_slices = get_slice_data_via_tag(
+            spritesheet=spritesheet, tag_name=tag_name, data=self.data
+        )
+        if FLAGS.game.collision.masks:
+            self.frame_set.build_masks()
         self.n_frames = len(self.frames)
         self.reset_frames()
 
-        self.frame_duration_count = 0.0
+        # Unboxed, a float attribute would be a new object every tick
+        self.frame_duration_count = array("d", [0.0])
         self.total_frame_iterations = self.n_frames * loops
         self.frame_iterations = 0
 
         self.rect = self.current_frame.get_rect()
 
     def reset_frames(self):
-        self.frame_idx_cycle = cycle(range(self.n_frames))
-        self.frame_idx = next(self.frame_idx_cycle)
+        self.frame_idx = 0
         self.frame_iterations = 0
 
-    def parse_frames(self) -> list[tuple[Surface, float]]:
-        frames = []
-        for idx_frame in self.data:
-            frame = self.data[idx_frame]
-            w = frame["w"]
-            h = frame["h"]
-
-            original_surface = Surface((w, h), SRCALPHA)
-            area = Rect(frame["x"], frame["y"], w, h)
-            original_surface.blit(source=self.spritesheet, dest=(0, 0), area=area)
-
-            scaled_surface = upscale_surface(surface=original_surface)
-            duration = frame["duration"] / 1000
-            frames.append((scaled_surface, duration))
-
-        return frames
+    def parse_frames(self) -> FrameSet:
+        return FRAME_STORE.get(
+            spritesheet=self.spritesheet,
+            tag_name=self.tag_name or "all",
+            data=self.data,
+        )
 
     def update(self, delta: float) -> bool:
         if self.loops > 0:
@@ -89,27 +125,52 @@ class Animation(Sprite):
                 self.reset_frames()
                 return False
 
-        self.frame_duration_count += delta
-        if self.frame_duration_count >= self.current_frame_duration:
-            self.frame_duration_count -= self.current_frame_duration
-            self.frame_idx = next(self.frame_idx_cycle)
-            self.frame_iterations += 1
+        elapsed = self.frame_duration_count
+        elapsed[0] += delta
+        if elapsed[0] >= self.current_frame_duration:
+            elapsed[0] -= self.current_frame_duration
+            self.frame_idx = (self.frame_idx + 1) % self.n_frames
+            # Only finite loops count, an endless count outgrows the small ints
+            if self.loops > 0:
+                self.frame_iterations += 1
 
         return True
 
-    def draw(self, surface: Surface, topleft: Vector2, hz_flip: bool = False):
-        frame = self.current_frame
+    def draw(self, surface: Surface, topleft: Vector2, hz_flip: bool = False) -> Rect:
         if hz_flip:
-            copy = frame.copy()
-            frame = transform.flip(copy, True, False)
+            region = self.frame_set.flipped[self.frame_idx][0]
+        else:
+            region = self.current_frame
+
+        dest = (topleft[0] + region.offset[0], topleft[1] + region.offset[1])
+        return surface.blit(source=region.page, dest=dest, area=region.area)
+
+    def set_slice_rect(
+        self, out: Rect, name: str, topleft: Vector2, hz_flip: bool = False
+    ) -> bool:
+        """Places the current frame's slice into out, False without one."""
+        slices = self.flipped_slices if hz_flip else self.slices
+        if name not in slices:
+            return False
 
-        surface.blit(source=frame, dest=topleft)
+        x, y, w, h = slices[name][self.frame_idx]
+        if not w or not h:
+            return False
+
+        out.update(topleft[0] + x, topleft[1] + y, w, h)
+        return True
+
+    def get_mask(self, hz_flip: bool = False) -> tuple[Mask, tuple[int, int]]:
+        """Current frame's mask and its offset from the draw position."""
+        if hz_flip:
+            return self.frame_set.flipped_masks[self.frame_idx]
+        return self.frame_set.masks[self.frame_idx]
 
     def __str__(self) -> str:
         return f"Sprite[Fm{self.frame_idx}/{self.n_frames}|Dr{self.current_frame_duration}]"
 
     @property
-    def current_frame(self) -> Surface:
+    def current_frame(self) -> AtlasRegion:
         return self.frames[self.frame_idx][0]
 
     @property
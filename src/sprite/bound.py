@@ -6,6 +6,7 @@ from pygame import Rect
 from pygame.surface import Surface
 
 from src.sprite.base import Animation
+from src.util.camera import Camera, blit_in_view
 from src.util.image import get_surface
 from src.util.math import get_hitbox_from_rect, get_rect_offset
 from src.util.types import HitboxRelPos, WindowRelPos
@@ -24,8 +25,8 @@ class Bound:
             0, 0, self.image_source.rect.width, self.image_source.rect.height
         )
         self.image_rect.center = (
-            int(self.window.x * FLAGS.game.window.width),
-            int(self.window.y * FLAGS.game.window.height),
+            int(self.window.x * FLAGS.game.stage.width),
+            int(self.window.y * FLAGS.game.stage.height),
         )
         self.hitbox_rect = get_hitbox_from_rect(
             rect=self.image_rect, hitbox=self.hitbox
@@ -33,24 +34,34 @@ class Bound:
         self.hitbox_offset = get_rect_offset(
             inside=self.hitbox_rect, enclosure=self.image_rect
         )
+        self.offset_x = int(self.hitbox_offset.x)
+        self.offset_y = int(self.hitbox_offset.y)
+        self.debug = FLAGS.game.debug.bounds
         self.debug_surface = get_surface(
             rect=self.hitbox_rect, color=(255, 255, 255, 64)
         )
 
     @property
     def image_start(self) -> tuple[int, int]:
+        """The image rect follows the hitbox lazily, only when it is read."""
+        self.align_rects()
         return self.image_rect.topleft
 
     def align_rects(self):
-        self.image_rect.x = self.hitbox_rect.x - self.hitbox_offset.x
-        self.image_rect.y = self.hitbox_rect.y - self.hitbox_offset.y
+        self.image_rect.x = self.hitbox_rect.x - self.offset_x
+        self.image_rect.y = self.hitbox_rect.y - self.offset_y
 
     def update_hitbox(self, new: Rect):
-        self.hitbox_rect = new
-        self.align_rects()
+        # Copied in place, others keep a reference to the hitbox rect
+        self.hitbox_rect.update(new)
 
-    def draw(self, surface: Surface):
-        if not FLAGS.game.debug.bounds:
+    def draw(self, surface: Surface, camera: Optional[Camera] = None) -> Optional[Rect]:
+        if not self.debug:
             return None
 
-        surface.blit(self.debug_surface, self.hitbox_rect.topleft)
+        return blit_in_view(
+            surface=surface,
+            source=self.debug_surface,
+            topleft=self.hitbox_rect.topleft,
+            camera=camera,
+        )
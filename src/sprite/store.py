@@ -0,0 +1,207 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import *
+
+from absl import flags
+from pygame import SRCALPHA
+from pygame.mask import Mask, from_surface
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from src.sprite.atlas import (
+    AtlasRegion,
+    TextureAtlas,
+    get_flipped_standalone_region,
+    get_standalone_region,
+)
+from src.util.cache import load_frames_cache, save_frames_cache
+from src.util.image import upscale_surface
+from src.util.types import SpritesheetData, SpritesheetDict
+
+FLAGS = flags.FLAGS
+
+FrameKey = tuple[str, str, float]
+Frames = tuple[tuple[AtlasRegion, float], ...]
+FrameMasks = tuple[tuple[Mask, tuple[int, int]], ...]
+
+
+def get_frame_surface(spritesheet: Surface, frame: SpritesheetData) -> Surface:
+    w = frame["w"]
+    h = frame["h"]
+
+    original_surface = Surface((w, h), SRCALPHA)
+    area = Rect(frame["x"], frame["y"], w, h)
+    original_surface.blit(source=spritesheet, dest=(0, 0), area=area)
+
+    return upscale_surface(surface=original_surface)
+
+
+@dataclass(frozen=True)
+class FrameSet:
+    key: FrameKey
+    frames: Frames
+    atlas: Optional[TextureAtlas] = field(default=None, compare=False)
+
+    @cached_property
+    def flipped(self) -> Frames:
+        # Mirrored once on first use, so left-facing draws never allocate
+        flipped = []
+        for idx_frame, (region, duration) in enumerate(self.frames):
+            if self.atlas is None:
+                region = get_flipped_standalone_region(region=region)
+            else:
+                key = (self.key[0], self.key[1], idx_frame, True)
+                region = self.atlas.add_flipped(key=key, region=region)
+            flipped.append((region, duration))
+
+        return tuple(flipped)
+
+    @cached_property
+    def masks(self) -> FrameMasks:
+        # Masks of the trimmed regions, placed by the same offset as a draw
+        return tuple(
+            (from_surface(region.get_surface()), region.offset)
+            for region, _ in self.frames
+        )
+
+    @cached_property
+    def flipped_masks(self) -> FrameMasks:
+        return tuple(
+            (from_surface(region.get_surface()), region.offset)
+            for region, _ in self.flipped
+        )
+
+    def build_masks(self) -> tuple[FrameMasks, FrameMasks]:
+        """Both facings up front, a hit check should never compute a mask."""
+        return self.masks, self.flipped_masks
+
+    @property
+    def regions(self) -> list[AtlasRegion]:
+        frames = self.frames
+        if "flipped" in self.__dict__:
+            frames = frames + self.flipped
+
+        return [region for region, _ in frames]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(region.nbytes for region in self.regions)
+
+    @property
+    def frame_nbytes(self) -> int:
+        return sum(region.frame_nbytes for region in self.regions)
+
+
+class FrameStore:
+    """
+    Process-wide, read-only frames shared by every Animation of the same
+    sheet, tag and scale. Playback state stays on the Animation itself.
+    """
+
+    def __init__(self):
+        self.frame_sets: dict[FrameKey, FrameSet] = {}
+        self.references: dict[FrameKey, int] = {}
+        self.atlas: Optional[TextureAtlas] = None
+
+    @staticmethod
+    def get_key(spritesheet: SpritesheetDict, tag_name: str) -> FrameKey:
+        # Sheets built without a digest are still shared per loaded image
+        sheet = spritesheet.digest or f"id-{id(spritesheet.image)}"
+        return (sheet, tag_name, FLAGS.game.images.upscale)
+
+    def get_atlas(self) -> Optional[TextureAtlas]:
+        if not FLAGS.game.images.atlas:
+            return None
+
+        if self.atlas is None:
+            self.atlas = TextureAtlas(page_size=FLAGS.game.images.atlas_page_size)
+        return self.atlas
+
+    def load(
+        self,
+        key: FrameKey,
+        spritesheet: SpritesheetDict,
+        tag_name: str,
+        data: dict[int, SpritesheetData],
+    ) -> Frames:
+        surfaces = load_frames_cache(digest=spritesheet.digest, tag_name=tag_name)
+
+        if surfaces is None or len(surfaces) != len(data):
+            surfaces = [
+                get_frame_surface(spritesheet=spritesheet.image, frame=data[idx])
+                for idx in data
+            ]
+            save_frames_cache(
+                digest=spritesheet.digest, tag_name=tag_name, surfaces=surfaces
+            )
+
+        atlas = self.get_atlas()
+        frames = []
+        for idx_ordered, (surface, idx_frame) in enumerate(zip(surfaces, data)):
+            if atlas is None:
+                region = get_standalone_region(surface=surface)
+            else:
+                atlas_key = (key[0], key[1], idx_ordered, False)
+                region = atlas.add(key=atlas_key, surface=surface)
+
+            duration = data[idx_frame]["duration"] / 1000
+            frames.append((region, duration))
+
+        return tuple(frames)
+
+    def get(
+        self,
+        spritesheet: SpritesheetDict,
+        tag_name: str,
+        data: dict[int, SpritesheetData],
+    ) -> FrameSet:
+        key = FrameStore.get_key(spritesheet=spritesheet, tag_name=tag_name)
+
+        if key not in self.frame_sets:
+            frames = self.load(
+                key=key, spritesheet=spritesheet, tag_name=tag_name, data=data
+            )
+            self.frame_sets[key] = FrameSet(
+                key=key, frames=frames, atlas=self.get_atlas()
+            )
+            self.references[key] = 0
+
+        self.references[key] += 1
+        return self.frame_sets[key]
+
+    def clear(self):
+        self.frame_sets.clear()
+        self.references.clear()
+        self.atlas = None
+
+    @property
+    def held_nbytes(self) -> int:
+        if self.atlas is not None:
+            return self.atlas.nbytes
+
+        return sum(frame_set.nbytes for frame_set in self.frame_sets.values())
+
+    @property
+    def requested_nbytes(self) -> int:
+        return sum(
+            self.frame_sets[key].frame_nbytes * count
+            for key, count in self.references.items()
+        )
+
+    def report(self) -> str:
+        held = self.held_nbytes / 2**20
+        requested = self.requested_nbytes / 2**20
+        saved = requested - held
+        report = (
+            f"Frame store: {len(self.frame_sets)} frame sets, "
+            f"{sum(self.references.values())} animations | "
+            f"held {held:.2f} MiB, unshared {requested:.2f} MiB, "
+            f"saved {saved:.2f} MiB"
+        )
+        if self.atlas is not None:
+            report += "\n" + self.atlas.report()
+
+        return report
+
+
+FRAME_STORE = FrameStore()
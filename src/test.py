@@ -5,9 +5,15 @@ import pygame
 from absl import flags
 from pygame.sprite import Group
 
+from src.ability.attack import resolve_attacks
 from src.asset import get_assets
 from src.cluster.platform import Platform
 from src.cluster.player import Player
+from src.cluster.stage import create_stage
+from src.sprite.store import FRAME_STORE
+from src.util.camera import Camera
+from src.util.clock import FixedTimestep
+from src.util.collision import CollisionWorld
 from src.util.input import (
     add_new_controller,
     map_controller_action,
@@ -15,6 +21,8 @@ from src.util.input import (
     remove_controller,
 )
 from src.util.logger import TextLogger
+from src.util.profiler import FrameProfiler
+from src.util.render import Renderer
 from src.util.state import ActionState, ActionStateRandomizer
 
 FLAGS = flags.FLAGS
@@ -44,23 +52,36 @@ class TestEnvironment:
         try:
             self.start()
         finally:
+            if self.profiler.enabled:
+                print(self.profiler.report())
+                self.profiler.save(path=FLAGS.game.profiler.output)
             pygame.quit()
 
     @staticmethod
     def preload(text_logger: TextLogger):
         text_logger.preload("System")
 
-        categories = {
-            "FPS": ["STABLE", "DECREASED", "LOW"],
-        }
-        text_logger.preload_dict(categories=categories)
-
     def declare_variables(self):
         """FPS Counter"""
         self.delta_counter = 0
         self.fps_counter = 0
         self.previous_fps = 0
 
+        """Frame Profiler"""
+        self.profiler = FrameProfiler(
+            phases=[
+                "tick",
+                "events",
+                "input",
+                "update",
+                "log",
+                "background",
+                "draw",
+                "hud",
+                "flip",
+            ]
+        )
+
     def debug_fps(self, delta: float):
         self.delta_counter += delta
         self.fps_counter += 1
@@ -68,20 +89,10 @@ class TestEnvironment:
             self.delta_counter -= 1
             self.previous_fps = self.fps_counter
             self.fps_counter = 0
-        self.rate = self.previous_fps / FLAGS.game.clock.fps
 
     def text_log(self, text_logger: TextLogger):
         text_logger.add("System")
-
-        text_logger.decide(
-            category="FPS",
-            values=["STABLE", "DECREASED", "LOW"],
-            conditions=[
-                self.rate >= 1.0,
-                0.8 < self.rate < 1.0,
-                self.rate <= 0.8,
-            ],
-        )
+        text_logger.add_pair(key="FPS", value=self.previous_fps)
 
     def start(self):
         """TEXT LOGGER"""
@@ -92,9 +103,25 @@ class TestEnvironment:
         ActionState.preload(text_logger=text_logger)
         Player.preload(text_logger=text_logger)
         Platform.preload(text_logger=text_logger)
+        profile_logger = TextLogger(
+            size=16, rel_x=0.02, rel_y=0.02, rel_nline=0.03, rel_col=0.192
+        )
+        show_profile = self.profiler.enabled and FLAGS.game.profiler.overlay
+        profiler = self.profiler
 
         """SETTING"""
+        # First, a loaded stage sets the size the camera and players read
+        stage = create_stage()
         delta = 0
+        timestep = FixedTimestep(
+            tick_rate=FLAGS.game.clock.tick_rate, max_ticks=FLAGS.game.clock.max_ticks
+        )
+        renderer = Renderer(
+            screen=self.screen,
+            background=self.asset["test_env_bg"],
+            dirty=FLAGS.game.render.dirty_rects,
+        )
+        camera = Camera()
         joysticks = {}
         p2_joy_id = None
 
@@ -102,34 +129,24 @@ class TestEnvironment:
         player_1 = Player(sheet=self.asset["green-slime"], rel_x=0.4)
         player_2 = Player(sheet=self.asset["blue-slime"], rel_x=0.6, face_left=True)
         players = Group(player_1, player_2)
+        if FLAGS.game.debug.assets:
+            print(FRAME_STORE.report())
 
-        platform_1 = Platform(
-            rel_x=0.0, rel_y=0.55, rel_width=1.0, rel_height=0.5, disable_debug=True
-        )
-        platform_2 = Platform(
-            rel_x=0.335, rel_y=0.36, rel_width=0.3282, rel_height=0.063
-        )
-        platform_3 = Platform(
-            rel_x=0.069, rel_y=0.205, rel_width=0.207, rel_height=0.063
-        )
-        platform_4 = Platform(
-            rel_x=0.725, rel_y=0.205, rel_width=0.207, rel_height=0.063
-        )
-        platforms = Group(platform_1, platform_2, platform_3, platform_4)
-
-        p1_collisions = Group(platforms, player_2)
-        p2_collisions = Group(platforms, player_1)
+        world = CollisionWorld()
+        world.add_static(*stage.platforms)
+        world.add_dynamic(*players)
+        p1_collisions = world.view(owner=player_1)
+        p2_collisions = world.view(owner=player_2)
 
         """Randomizer"""
         # random_actions = ActionStateRandomizer()
 
         """GAME LOOP"""
         while self.running:
+            profiler.start_frame()
             delta = self.clock.tick(FLAGS.game.clock.fps) / 1000
             self.debug_fps(delta=delta)
-            if delta > FLAGS.game.clock.max_delta:
-                print(f"delta overriden: {delta} second(s)")
-                delta = FLAGS.game.clock.max_delta
+            profiler.lap("tick")
 
             """EVENT PROCESSING"""
             try:
@@ -144,6 +161,7 @@ class TestEnvironment:
                         remove_controller(event=event, joysticks=joysticks)
             except SystemError as e:
                 print(f"{e}\nPossibly a disconnected controller.")
+            profiler.lap("events")
 
             if joysticks:
                 controller_actions = map_controller_action(
@@ -159,9 +177,19 @@ class TestEnvironment:
 
             keyboard_actions = map_keyboard_action()
             player_2.receive_actions(actions=keyboard_actions)
+            profiler.lap("input")
+
+            """FIXED TICK SIMULATION"""
+            for _ in range(timestep.advance(delta=delta)):
+                for player in players:
+                    player.save_state()
 
-            player_1.update(delta=delta, collisions=p1_collisions)
-            player_2.update(delta=delta, collisions=p2_collisions)
+                player_1.update(delta=timestep.tick_delta, collisions=p1_collisions)
+                world.update(sprite=player_1)
+                player_2.update(delta=timestep.tick_delta, collisions=p2_collisions)
+                world.update(sprite=player_2)
+                resolve_attacks(attackers=players, world=world)
+            profiler.lap("update")
 
             # text_logger.add_empty()
             # player_1.text_log(text_logger=text_logger)
@@ -171,19 +199,44 @@ class TestEnvironment:
             player_2.text_log(text_logger=text_logger)
 
             self.text_log(text_logger=text_logger)
+            if show_profile:
+                profiler.text_log(text_logger=profile_logger)
+            profiler.lap("log")
 
             """DISPLAY PROCESSING"""
-            self.screen.blit(source=self.asset["test_env_bg"], dest=(0, 0))
-
+            camera.follow(rects=[player.rect for player in players])
+            if camera.moved:
+                # Everything shifted on screen, no regions to reuse
+                renderer.invalidate()
+                renderer.scroll(offset=camera.offset)
+            renderer.clear()
+            profiler.lap("background")
+
+            renderer.extend(stage.draw(surface=self.screen, camera=camera))
             for player in players:
-                player.draw(surface=self.screen)
+                renderer.add(
+                    player.draw(
+                        surface=self.screen, alpha=timestep.alpha, camera=camera
+                    )
+                )
 
             if FLAGS.game.debug.bounds:
-                for land in platforms:
-                    land.show_bounds(surface=self.screen)
+                renderer.extend(stage.draw_bounds(surface=self.screen, camera=camera))
                 for player in players:
-                    player.draw_bounds(surface=self.screen)
+                    renderer.extend(
+                        player.draw_bounds(surface=self.screen, camera=camera)
+                    )
+
+            profiler.lap("draw")
+
+            renderer.extend(text_logger.draw(surface=self.screen))
+            if show_profile:
+                renderer.extend(profile_logger.draw(surface=self.screen))
+            profiler.lap("hud")
 
-            text_logger.draw(surface=self.screen)
+            renderer.present()
+            profiler.lap("flip")
+            profiler.finish_frame()
 
-            pygame.display.flip()
+        if timestep.dropped_ticks:
+            print(f"Simulation fell behind: dropped {timestep.dropped_ticks} tick(s)")
@@ -0,0 +1,78 @@
+import json
+import os
+from pathlib import Path
+from typing import *
+
+import pygame
+from absl import flags
+from pygame.surface import Surface
+
+FLAGS = flags.FLAGS
+
+# Bump whenever the on-disk layout of the frames cache changes
+FRAMES_CACHE_VERSION = 1
+
+
+def get_frames_cache_path(digest: str, tag_name: str) -> Path:
+    upscale = FLAGS.game.images.upscale
+    name = f"{digest}-{tag_name}-x{upscale:g}-v{FRAMES_CACHE_VERSION}.bin"
+    return Path(FLAGS.game.cache.frames) / name
+
+
+def is_frames_cache_enabled(digest: str) -> bool:
+    return FLAGS.game.cache.enabled and bool(digest)
+
+
+def load_frames_cache(digest: str, tag_name: str) -> Optional[list[Surface]]:
+    if not is_frames_cache_enabled(digest=digest):
+        return None
+
+    path = get_frames_cache_path(digest=digest, tag_name=tag_name)
+    try:
+        with open(file=path, mode="rb") as cache_file:
+            header = json.loads(cache_file.readline())
+            data = cache_file.read()
+    except (OSError, ValueError):
+        return None
+
+    # Valid JSON with the wrong layout is a miss too, the frames get rebuilt
+    try:
+        sizes = [(int(width), int(height)) for width, height in header["sizes"]]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    surfaces = []
+    offset = 0
+    view = memoryview(data)
+    for width, height in sizes:
+        length = width * height * 4
+        buffer = view[offset : offset + length]
+        if len(buffer) != length:
+            return None
+
+        # convert_alpha copies the pixels, so the shared buffer is never kept
+        surface = pygame.image.frombuffer(buffer, (width, height), "RGBA")
+        surfaces.append(surface.convert_alpha())
+        offset += length
+
+    return surfaces
+
+
+def save_frames_cache(digest: str, tag_name: str, surfaces: list[Surface]):
+    if not is_frames_cache_enabled(digest=digest):
+        return None
+
+    path = get_frames_cache_path(digest=digest, tag_name=tag_name)
+    header = {"sizes": [surface.get_size() for surface in surfaces]}
+    data = b"".join(pygame.image.tobytes(surface, "RGBA") for surface in surfaces)
+
+    # Written next to the target first so a crash never leaves a partial cache
+    temp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file=temp_path, mode="wb") as cache_file:
+            cache_file.write(json.dumps(header).encode() + b"\n")
+            cache_file.write(data)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"{e}\nFrames cache could not be written.")
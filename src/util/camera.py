@@ -0,0 +1,79 @@
+from typing import *
+
+from absl import flags
+from pygame import Rect
+from pygame.sprite import Sprite
+from pygame.surface import Surface
+
+FLAGS = flags.FLAGS
+
+
+class Camera:
+    """
+    The part of the stage shown in the window. Sprites keep world
+    coordinates, drawing shifts them by the view's topleft and skips
+    whatever falls outside of the view.
+    """
+
+    def __init__(
+        self,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        stage: Optional[Rect] = None,
+    ):
+        self.view = Rect(
+            0,
+            0,
+            FLAGS.game.window.width if width is None else width,
+            FLAGS.game.window.height if height is None else height,
+        )
+        if stage is None:
+            stage = Rect(0, 0, FLAGS.game.stage.width, FLAGS.game.stage.height)
+        self.stage = stage
+        self.moved = False
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        return self.view.x, self.view.y
+
+    def look_at(self, x: int, y: int):
+        """Centers the view, a stage smaller than the view stays centered."""
+        previous = self.view.topleft
+        self.view.center = (x, y)
+        self.view.clamp_ip(self.stage)
+        self.moved = self.view.topleft != previous
+
+    def follow(self, rects: Iterable[Rect]):
+        """Centers the view between every rect."""
+        xs, ys = zip(*(rect.center for rect in rects))
+        self.look_at(x=sum(xs) // len(xs), y=sum(ys) // len(ys))
+
+    def is_visible(self, rect: Union[Rect, tuple[int, int, int, int]]) -> bool:
+        return self.view.colliderect(rect)
+
+    def cull(self, sprites: Iterable[Sprite]) -> list[Sprite]:
+        view = self.view
+        return [sprite for sprite in sprites if view.colliderect(sprite.rect)]
+
+    def to_screen(self, topleft: tuple[int, int]) -> tuple[int, int]:
+        return topleft[0] - self.view.x, topleft[1] - self.view.y
+
+    def blit(
+        self, surface: Surface, source: Surface, topleft: tuple[int, int]
+    ) -> Optional[Rect]:
+        x, y = topleft
+        if not self.view.colliderect((x, y, *source.get_size())):
+            return None
+        return surface.blit(source, (x - self.view.x, y - self.view.y))
+
+
+def blit_in_view(
+    surface: Surface,
+    source: Surface,
+    topleft: tuple[int, int],
+    camera: Optional[Camera] = None,
+) -> Optional[Rect]:
+    """World coordinates are screen coordinates without a camera."""
+    if camera is None:
+        return surface.blit(source, topleft)
+    return camera.blit(surface=surface, source=source, topleft=topleft)
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import *
+
+from absl import flags
+
+from src.util.types import Seconds
+
+FLAGS = flags.FLAGS
+
+
+@dataclass
+class FixedTimestep:
+    """
+    Accumulates real frame time and hands it out as fixed simulation ticks,
+    so gameplay is the same at any frame rate. Time beyond max_ticks per
+    frame is dropped to avoid a spiral of ever longer frames, and counted.
+    """
+
+    tick_rate: int
+    max_ticks: int
+
+    def __post_init__(self):
+        self.tick_delta: Seconds = 1 / self.tick_rate
+        self.accumulator: Seconds = 0.0
+        self.dropped_ticks = 0
+
+    def advance(self, delta: Seconds) -> int:
+        self.accumulator += delta
+
+        ticks = int(self.accumulator // self.tick_delta)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = self.tick_delta * ticks
+
+        self.accumulator -= self.tick_delta * ticks
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """How far the render time is between the last two ticks."""
+        return self.accumulator / self.tick_delta
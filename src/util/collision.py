@@ -0,0 +1,218 @@
+from typing import *
+
+from absl import flags
+from pygame.rect import Rect
+from pygame.sprite import Sprite
+
+FLAGS = flags.FLAGS
+
+Cell = tuple[int, int]
+
+
+class SpatialHash:
+    """
+    Uniform grid broad-phase, every sprite is registered in each cell its
+    rect overlaps so a query only visits the cells around the query rect.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        # Emptied buckets are kept, a sprite moving back reuses them
+        self.cells: dict[Cell, list[Sprite]] = {}
+        self.sprite_rects: dict[Sprite, Rect] = {}
+        # Cell ranges as rects in cell space, compared without building tuples
+        self.sprite_spans: dict[Sprite, Rect] = {}
+        self.span = Rect(0, 0, 0, 0)
+        self.old_span = Rect(0, 0, 0, 0)
+        self.order: dict[Sprite, int] = {}
+        self.order_key = self.order.__getitem__
+        self.counter = 0
+
+    def __len__(self) -> int:
+        return len(self.sprite_spans)
+
+    def __iter__(self) -> Iterator[Sprite]:
+        return iter(self.sprite_spans)
+
+    def __contains__(self, sprite: Sprite) -> bool:
+        return sprite in self.sprite_spans
+
+    def set_span(self, span: Rect, rect: Rect):
+        size = self.cell_size
+        # Right and bottom edges are exclusive, as in Rect.colliderect
+        x = rect.left // size
+        y = rect.top // size
+        span.update(
+            x, y, (rect.right - 1) // size + 1 - x, (rect.bottom - 1) // size + 1 - y
+        )
+
+    def add_to_cells(self, sprite: Sprite, span: Rect, skip: Optional[Rect] = None):
+        """Every cell of span, except the ones of skip."""
+        cells = self.cells
+        for x in range(span.left, span.right):
+            for y in range(span.top, span.bottom):
+                if skip is not None and skip.collidepoint(x, y):
+                    continue
+                bucket = cells.get((x, y))
+                if bucket is None:
+                    cells[(x, y)] = bucket = []
+                bucket.append(sprite)
+
+    def remove_from_cells(
+        self, sprite: Sprite, span: Rect, skip: Optional[Rect] = None
+    ):
+        cells = self.cells
+        for x in range(span.left, span.right):
+            for y in range(span.top, span.bottom):
+                if skip is None or not skip.collidepoint(x, y):
+                    cells[(x, y)].remove(sprite)
+
+    def insert(self, sprite: Sprite):
+        if sprite in self.sprite_spans:
+            return self.update(sprite=sprite)
+
+        self.order[sprite] = self.counter
+        self.counter += 1
+
+        self.sprite_rects[sprite] = sprite.rect.copy()
+        self.sprite_spans[sprite] = span = Rect(0, 0, 0, 0)
+        self.set_span(span=span, rect=sprite.rect)
+        self.add_to_cells(sprite=sprite, span=span)
+
+    def remove(self, sprite: Sprite):
+        span = self.sprite_spans.pop(sprite, None)
+        if span is not None:
+            self.remove_from_cells(sprite=sprite, span=span)
+        self.order.pop(sprite, None)
+        self.sprite_rects.pop(sprite, None)
+
+    def update(self, sprite: Sprite):
+        hashed_rect = self.sprite_rects[sprite]
+        if hashed_rect == sprite.rect:
+            return None
+        hashed_rect.update(sprite.rect)
+
+        span = self.span
+        self.set_span(span=span, rect=hashed_rect)
+        hashed_span = self.sprite_spans[sprite]
+        if span == hashed_span:
+            return None
+
+        # Only the cells entered or left change, no cell tuples are kept
+        old_span = self.old_span
+        old_span.update(hashed_span)
+        hashed_span.update(span)
+        self.remove_from_cells(sprite=sprite, span=old_span, skip=span)
+        self.add_to_cells(sprite=sprite, span=span, skip=old_span)
+
+    def query(self, rect: Rect, exclude: Optional[Sprite] = None) -> list[Sprite]:
+        """Sprites overlapping rect, in insertion order."""
+        found = []
+        self.query_into(rect=rect, found=found, exclude=exclude)
+        return found
+
+    def query_into(
+        self, rect: Rect, found: list[Sprite], exclude: Optional[Sprite] = None
+    ):
+        """Same as query, but appends to found so the caller can reuse a list."""
+        cells = self.cells
+        if not cells:
+            return None
+
+        # Narrow phase is done here, so only actual overlaps are deduplicated
+        size = self.cell_size
+        x_start = rect.left // size
+        x_stop = (rect.right - 1) // size + 1
+        y_start = rect.top // size
+        y_stop = (rect.bottom - 1) // size + 1
+
+        start = len(found)
+        colliderect = rect.colliderect
+        for x in range(x_start, x_stop):
+            for y in range(y_start, y_stop):
+                bucket = cells.get((x, y))
+                if bucket is None:
+                    continue
+
+                for sprite in bucket:
+                    if sprite is exclude or sprite in found:
+                        continue
+                    if colliderect(sprite.rect):
+                        found.append(sprite)
+
+        if len(found) - start < 2:
+            return None
+        # Insertion order keeps results deterministic, like iterating a Group
+        found[start:] = sorted(found[start:], key=self.order_key)
+
+
+class CollisionWorld:
+    """
+    Static sprites (platforms) are hashed once, dynamic sprites (players) are
+    re-hashed through update() after they move.
+    """
+
+    def __init__(self, cell_size: Optional[int] = None):
+        if cell_size is None:
+            cell_size = FLAGS.game.collision.cell_size
+
+        self.static = SpatialHash(cell_size=cell_size)
+        self.dynamic = SpatialHash(cell_size=cell_size)
+        self.found: list[Sprite] = []
+
+    def add_static(self, *sprites: Sprite):
+        for sprite in sprites:
+            self.static.insert(sprite=sprite)
+
+    def add_dynamic(self, *sprites: Sprite):
+        for sprite in sprites:
+            self.dynamic.insert(sprite=sprite)
+
+    def remove(self, sprite: Sprite):
+        self.static.remove(sprite=sprite)
+        self.dynamic.remove(sprite=sprite)
+
+    def update(self, sprite: Sprite):
+        self.dynamic.update(sprite=sprite)
+
+    def query(self, rect: Rect, exclude: Optional[Sprite] = None) -> list[Sprite]:
+        """The returned list is reused, it is only valid until the next query."""
+        found = self.found
+        found.clear()
+        self.static.query_into(rect=rect, found=found)
+        self.dynamic.query_into(rect=rect, found=found, exclude=exclude)
+        return found
+
+    def view(self, owner: Sprite) -> "CollisionView":
+        return CollisionView(world=self, owner=owner)
+
+
+class CollisionView:
+    """Everything in the world except its owner, what a player collides with."""
+
+    def __init__(self, world: CollisionWorld, owner: Sprite):
+        self.world = world
+        self.owner = owner
+
+    def __contains__(self, sprite: Sprite) -> bool:
+        if sprite is self.owner:
+            return False
+        return sprite in self.world.static or sprite in self.world.dynamic
+
+    def __iter__(self) -> Iterator[Sprite]:
+        yield from self.world.static
+        for sprite in self.world.dynamic:
+            if sprite is not self.owner:
+                yield sprite
+
+    def query(self, rect: Rect) -> list[Sprite]:
+        return self.world.query(rect=rect, exclude=self.owner)
+
+
+Collisions = Union[Iterable[Sprite], CollisionView]
+
+
+def get_candidates(rect: Rect, collisions: Collisions) -> Iterable[Sprite]:
+    if isinstance(collisions, CollisionView):
+        return collisions.query(rect=rect)
+    return collisions
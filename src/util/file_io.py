@@ -1,16 +1,53 @@
+import hashlib
+import io
 import json
+from pathlib import Path
 
+import numpy as np
 import pygame
 from absl import flags
 from pygame.locals import RLEACCEL
 
+from src.util.types import StageDict
+
 FLAGS = flags.FLAGS
 
 
-def load_spritesheet_json(filepath: str) -> tuple[dict, dict]:
-    with open(file=filepath, mode="r") as json_file:
-        json_dict = json.load(json_file)
+def read_bytes(filepath: str) -> bytes:
+    with open(file=filepath, mode="rb") as file:
+        return file.read()
+
+
+def parse_spritesheet_slices(json_dict: dict) -> dict[str, np.ndarray]:
+    """
+    One (x, y, w, h) row per frame and slice, in frame pixels. An Aseprite
+    slice key holds from its frame until the next key, frames before the
+    first key get an empty rect.
+    """
+    n_frames = len(json_dict["frames"])
+
+    parsed_slices = {}
+    for slice_data in json_dict["meta"].get("slices", []):
+        rects = np.zeros((n_frames, 4), dtype=np.int32)
+        keys = sorted(slice_data["keys"], key=lambda key: key["frame"])
+        for idx_key, key in enumerate(keys):
+            stop = n_frames
+            if idx_key + 1 < len(keys):
+                stop = keys[idx_key + 1]["frame"]
+
+            bounds = key["bounds"]
+            rects[key["frame"] : stop] = (
+                bounds["x"],
+                bounds["y"],
+                bounds["w"],
+                bounds["h"],
+            )
+        parsed_slices[slice_data["name"]] = rects
+
+    return parsed_slices
+
 
+def parse_spritesheet_json(json_dict: dict) -> tuple[dict, dict, dict]:
     parsed_frames = {}
     frames = json_dict["frames"]
     for idx_frame in range(len(frames)):
@@ -18,13 +55,72 @@ def load_spritesheet_json(filepath: str) -> tuple[dict, dict]:
         parsed_frames[idx_frame]["duration"] = frames[str(idx_frame)]["duration"]
 
     parsed_tags = json_dict["meta"]["frameTags"]
+    parsed_slices = parse_spritesheet_slices(json_dict=json_dict)
 
-    return parsed_frames, parsed_tags
+    return parsed_frames, parsed_tags, parsed_slices
 
 
-def load_png(filepath: str) -> pygame.Surface:
-    image = pygame.image.load(filepath)
+def load_spritesheet_json(filepath: str) -> tuple[dict, dict, dict]:
+    with open(file=filepath, mode="r") as json_file:
+        json_dict = json.load(json_file)
+
+    return parse_spritesheet_json(json_dict=json_dict)
+
+
+def parse_stage_json(json_dict: dict) -> StageDict:
+    """
+    Layers are drawn as rows of characters, each legend character is a tile
+    and its RGBA color. Any other character leaves the cell empty.
+    """
+    legend = json_dict["legend"]
+    tile_ids = {char: idx + 1 for idx, char in enumerate(legend)}
+    palette = [(0, 0, 0, 0)] + [tuple(color) for color in legend.values()]
+
+    layers = {}
+    for layer in json_dict["layers"]:
+        rows = layer["rows"]
+        tiles = np.zeros((len(rows), max(map(len, rows))), dtype=np.uint8)
+        for idx_row, row in enumerate(rows):
+            for idx_col, char in enumerate(row):
+                tiles[idx_row, idx_col] = tile_ids.get(char, 0)
+        layers[layer["name"]] = tiles
+
+    return StageDict(
+        tile_size=json_dict["tile_size"],
+        palette=palette,
+        layers=layers,
+        collision=json_dict.get("collision", []),
+    )
+
+
+def load_stage_json(filepath: str) -> StageDict:
+    with open(file=filepath, mode="r") as json_file:
+        json_dict = json.load(json_file)
+
+    return parse_stage_json(json_dict=json_dict)
+
+
+def decode_png(data: bytes, filepath: str) -> pygame.Surface:
+    # Display independent, safe to call off the main thread
+    return pygame.image.load(io.BytesIO(data), Path(filepath).name)
+
+
+def convert_png(image: pygame.Surface) -> pygame.Surface:
     image = image.convert_alpha()
     image.set_colorkey((0, 0, 0), RLEACCEL)
 
     return image
+
+
+def load_png(filepath: str) -> pygame.Surface:
+    image = pygame.image.load(filepath)
+
+    return convert_png(image=image)
+
+
+def get_bytes_digest(chunks: list[bytes]) -> str:
+    digest = hashlib.sha1()
+    for chunk in chunks:
+        digest.update(chunk)
+
+    return digest.hexdigest()
@@ -1,7 +1,9 @@
+from typing import *
+
 from absl import flags
 from pygame import transform
 from pygame.color import Color
-from pygame.locals import RLEACCEL, SRCALPHA
+from pygame.locals import BLEND_RGBA_MAX, RLEACCEL, SRCALPHA
 from pygame.rect import Rect
 from pygame.surface import Surface
 
@@ -18,6 +20,20 @@ def upscale_surface(surface: Surface) -> Surface:
     return scaled_surface
 
 
+def copy_pixels(
+    surface: Surface,
+    source: Surface,
+    dest: tuple[int, int],
+    area: Optional[Rect] = None,
+) -> Rect:
+    """
+    Copies source onto a cleared SRCALPHA surface as it is. Max blend keeps
+    the pixels, alpha blending onto transparent ones would darken the
+    antialiased edges.
+    """
+    return surface.blit(source, dest, area, special_flags=BLEND_RGBA_MAX)
+
+
 def get_surface(rect: Rect, color: Color) -> Surface:
     surface = Surface((rect.width, rect.height), flags=SRCALPHA)
     surface.fill(color)
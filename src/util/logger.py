@@ -1,7 +1,10 @@
+from typing import *
+
 from absl import flags
-from pygame import Surface
+from pygame import RLEACCEL, SRCALPHA, Rect, Surface
 
-from src.util.text import get_bitmap, get_font
+from src.util.image import copy_pixels
+from src.util.text import get_bitmap, get_font, get_glyph_atlas
 from src.util.types import Coordinate, FontSurface, PreloadCategoriesTyped, PreloadTyped
 
 FLAGS = flags.FLAGS
@@ -10,24 +13,45 @@ FLAGS = flags.FLAGS
 KEYPAIR_FMT = "{key}: {value}"
 INDENT_FMT = "  {value}"
 
+# Steady frames before the HUD layer is run-length encoded, drawing into an
+# encoded surface decodes and encodes it again
+ENCODE_AFTER_FRAMES = 30
+
+# Preloaded surfaces, or any other text drawn from the glyph atlas
+HudRow = tuple[Coordinate, Union[FontSurface, str, None]]
+
 
 class TextLogger:
+    """
+    Rows are composed into one cached HUD layer, only the rows that differ
+    from the last frame are cleared and drawn again.
+    """
+
     def __init__(
         self, size: int, rel_x: float, rel_y: float, rel_nline: float, rel_col: float
     ):
         font_name = "JetBrainsMono-Bold"
 
         self.font = get_font(name=font_name, size=size)
+        self.glyphs = get_glyph_atlas(name=font_name, size=size)
         self.x = FLAGS.game.window.width * rel_x
         self.y = FLAGS.game.window.height * rel_y
         self.nline = FLAGS.game.window.height * rel_nline
         self.col_size = FLAGS.game.window.width * rel_col
 
         self.preloaded: PreloadTyped = {}
-        self.to_display: list[tuple(Coordinate, FontSurface)] = []
+        self.preloaded_pairs: dict[tuple[str, str], FontSurface] = {}
+        self.to_display: list[HudRow] = []
 
         self.max_lines = 12
 
+        # Blits truncate float positions, the layer keeps the same pixels
+        self.origin = (int(self.x), int(self.y))
+        self.layer = Surface((0, 0), flags=SRCALPHA)
+        self.shown: list[HudRow] = []
+        self.bounds: Optional[Rect] = None
+        self.steady_frames = 0
+
     def preload(self, value: str, indented: bool = False):
         if value in self.preloaded:
             return None
@@ -42,14 +66,12 @@ class TextLogger:
 
     def preload_dict(self, categories: PreloadCategoriesTyped):
         for category in categories:
-            for value in categories[category]:
+            for value in [*categories[category], ""]:
                 text_value = KEYPAIR_FMT.format(key=category, value=value)
                 self.preload(value=text_value, indented=True)
+                self.preloaded_pairs[(category, value)] = self.preloaded[text_value]
 
-            text_value = KEYPAIR_FMT.format(key=category, value="")
-            self.preload(value=text_value, indented=True)
-
-    def add(self, value: str):
+    def get_coord(self) -> Coordinate:
         index = len(self.to_display)
         row = index % self.max_lines
         col = index // self.max_lines
@@ -57,16 +79,24 @@ class TextLogger:
         x_offset = self.col_size * col
         x = self.x + x_offset
         y = self.y + (self.nline * row)
+        return int(x), int(y)
 
-        if value is not None:
-            try:
-                font_surface = self.preloaded[value]
-            except KeyError as e:
-                print(f"{e}\nText surface has not been preloaded.")
-
-            self.to_display.append(((x, y), font_surface))
+    def add(self, value: Optional[str]):
+        """Preloaded values reuse their surface, others go through the atlas."""
+        if value is None:
+            self.to_display.append((self.get_coord(), None))
         else:
-            self.to_display.append(((x, y), None))
+            row = self.preloaded.get(value, value)
+            self.to_display.append((self.get_coord(), row))
+
+    def add_text(self, text: str, indented: bool = False):
+        """Any string, numbers and timings that change every frame included."""
+        if indented:
+            text = INDENT_FMT.format(value=text)
+        self.to_display.append((self.get_coord(), text))
+
+    def add_pair(self, key: str, value: Any):
+        self.add_text(text=KEYPAIR_FMT.format(key=key, value=value), indented=True)
 
     def decide(
         self,
@@ -81,21 +111,88 @@ class TextLogger:
                 value = v
                 break
 
-        self.add(KEYPAIR_FMT.format(key=category, value=value))
+        # Preloaded pairs skip formatting the same strings every frame
+        font_surface = self.preloaded_pairs.get((category, value))
+        if font_surface is None:
+            self.add_pair(key=category, value=value)
+        else:
+            self.to_display.append((self.get_coord(), font_surface))
 
     def add_empty(self, num=1):
         for _ in range(num):
             self.add(None)
 
-    def draw(self, surface: Surface):
-        for coord, font_surface in self.to_display:
-            if font_surface is None:
+    def get_layer_rect(self, coord: Coordinate, row: Union[FontSurface, str]) -> Rect:
+        if isinstance(row, str):
+            size = self.glyphs.get_size(text=row)
+        else:
+            size = row.get_size()
+        return Rect(coord[0] - self.origin[0], coord[1] - self.origin[1], *size)
+
+    def compose(self):
+        """Redraws the layer under the rows that changed since the last frame."""
+        current, shown = self.to_display, self.shown
+        changed = []
+        for idx in range(max(len(current), len(shown))):
+            new = current[idx] if idx < len(current) else None
+            old = shown[idx] if idx < len(shown) else None
+            if new == old:
                 continue
 
-            surface.blit(source=font_surface, dest=coord)
+            for entry in (old, new):
+                if entry is not None and entry[1] is not None:
+                    changed.append(self.get_layer_rect(*entry))
 
+        if not changed:
+            # Encoded, blits skip the empty space between the rows
+            self.steady_frames += 1
+            if self.steady_frames == ENCODE_AFTER_FRAMES:
+                self.layer.set_alpha(255, RLEACCEL)
+            return None
+
+        self.steady_frames = 0
+        self.layer.set_alpha(255)
+
+        rows = [
+            (self.get_layer_rect(coord=coord, row=row), row)
+            for coord, row in current
+            if row is not None
+        ]
+        rects = [rect for rect, _ in rows]
+        self.bounds = rects[0].unionall(rects[1:]) if rects else None
+
+        area = changed[0].unionall(changed[1:])
+        width, height = self.layer.get_size()
+        if self.bounds and (self.bounds.right > width or self.bounds.bottom > height):
+            self.layer = Surface(
+                (max(width, self.bounds.right), max(height, self.bounds.bottom)),
+                flags=SRCALPHA,
+            )
+            area = self.layer.get_rect()
+
+        self.layer.fill((0, 0, 0, 0), area)
+        for rect, row in rows:
+            if not rect.colliderect(area):
+                continue
+
+            if isinstance(row, str):
+                self.glyphs.draw(
+                    surface=self.layer, text=row, dest=rect.topleft, copy=True
+                )
+            else:
+                copy_pixels(surface=self.layer, source=row, dest=rect.topleft)
+
+    def draw(self, surface: Surface) -> list[Rect]:
+        self.compose()
+        self.shown = self.to_display
         self.to_display = []
 
+        if self.bounds is None:
+            return []
+
+        dest = (self.origin[0] + self.bounds.x, self.origin[1] + self.bounds.y)
+        return [surface.blit(source=self.layer, dest=dest, area=self.bounds)]
+
 
 # """Basic White Font"""
 # font_surface = get_bitmap(
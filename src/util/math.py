@@ -1,9 +1,11 @@
+from dataclasses import dataclass
 from typing import *
 
 from absl import flags
 from pygame import Rect, Vector2
 from pygame.sprite import Sprite
 
+from src.util.collision import Collisions, get_candidates
 from src.util.types import HitboxRelPos
 
 FLAGS = flags.FLAGS
@@ -18,52 +20,63 @@ def place_rect_on_top(top: Rect, bottom: Rect):
     top.y = bottom.y - top.height
 
 
-def contain_rect_in_window(rect: Rect):
-    # Enables sprites to jump over the window for a brief moment
+def get_stage_bounds() -> Rect:
+    # Enables sprites to jump over the stage for a brief moment
     above_offset = 300
-    window_rect = Rect(
+    return Rect(
         0,
         -above_offset,
-        FLAGS.game.window.width,
-        FLAGS.game.window.height + above_offset,
+        FLAGS.game.stage.width,
+        FLAGS.game.stage.height + above_offset,
     )
-    rect.clamp_ip(window_rect)
 
 
-def get_hitbox_from_rect(rect: Rect, hitbox: HitboxRelPos) -> Rect:
-    x = rect.x + int(rect.width * hitbox.x)
-    y = rect.y + int(rect.height * hitbox.y)
-    width = int(rect.width * hitbox.width)
-    height = int(rect.height * hitbox.height)
-    return Rect(x, y, width, height)
+def contain_rect_in_stage(rect: Rect, bounds: Optional[Rect] = None):
+    """Pass precomputed bounds on per-tick paths to avoid building them."""
+    if bounds is None:
+        bounds = get_stage_bounds()
+    rect.clamp_ip(bounds)
 
 
-def get_reversed_hitbox_from_rect(rect: Rect, hitbox: HitboxRelPos) -> Rect:
-    regular = get_hitbox_from_rect(rect=rect, hitbox=hitbox)
+def set_hitbox_from_rect(out: Rect, rect: Rect, hitbox: HitboxRelPos):
+    out.x = rect.x + int(rect.width * hitbox.x)
+    out.y = rect.y + int(rect.height * hitbox.y)
+    out.width = int(rect.width * hitbox.width)
+    out.height = int(rect.height * hitbox.height)
+
+
+def set_reversed_hitbox_from_rect(out: Rect, rect: Rect, hitbox: HitboxRelPos):
+    set_hitbox_from_rect(out=out, rect=rect, hitbox=hitbox)
 
-    x_excess = (regular.x + regular.width) - (rect.x + rect.width)
+    x_excess = out.right - rect.right
+    out.x = rect.x - x_excess
+
+
+def get_hitbox_from_rect(rect: Rect, hitbox: HitboxRelPos) -> Rect:
+    out = Rect(0, 0, 0, 0)
+    set_hitbox_from_rect(out=out, rect=rect, hitbox=hitbox)
+    return out
 
-    x = rect.x - x_excess
-    y = regular.y
-    width = regular.width
-    height = regular.height
 
-    return Rect(x, y, width, height)
+def get_reversed_hitbox_from_rect(rect: Rect, hitbox: HitboxRelPos) -> Rect:
+    out = Rect(0, 0, 0, 0)
+    set_reversed_hitbox_from_rect(out=out, rect=rect, hitbox=hitbox)
+    return out
 
 
 def get_rect_offset(inside: Rect, enclosure: Rect) -> Vector2:
     return Vector2(inside.x - enclosure.x, inside.y - enclosure.y)
 
 
-def get_collided(rect: Rect, collisions: list[Sprite]) -> Optional[Sprite]:
-    for collision in collisions:
+def get_collided(rect: Rect, collisions: Collisions) -> Optional[Sprite]:
+    for collision in get_candidates(rect=rect, collisions=collisions):
         if rect.colliderect(collision.rect):
             return collision
     return None
 
 
-def get_collided_below(rect: Rect, collisions: list[Sprite]) -> Optional[Sprite]:
-    for collision in collisions:
+def get_collided_below(rect: Rect, collisions: Collisions) -> Optional[Sprite]:
+    for collision in get_candidates(rect=rect, collisions=collisions):
         if rect.bottom < collision.rect.top:
             continue
 
@@ -72,6 +85,110 @@ def get_collided_below(rect: Rect, collisions: list[Sprite]) -> Optional[Sprite]
     return None
 
 
+@dataclass
+class Contact:
+    sprite: Optional[Sprite]
+    # Fraction of the motion travelled before touching the sprite
+    time: float
+
+
+# Reused by every sweep, a returned contact is only valid until the next one
+SWEPT_RECT = Rect(0, 0, 0, 0)
+MOVED_RECT = Rect(0, 0, 0, 0)
+X_CONTACT = Contact(sprite=None, time=0.0)
+Y_CONTACT = Contact(sprite=None, time=0.0)
+
+
+def get_swept_contact(
+    rect: Rect,
+    dx: int,
+    dy: int,
+    collisions: Collisions,
+    out: Optional[Contact] = None,
+) -> Optional[Contact]:
+    """
+    First sprite hit by rect moving along a single axis, so a fast motion
+    cannot tunnel through anything thinner than its step. Sprites already
+    overlapping rect only block when the motion does not leave them.
+    """
+    assert not (dx and dy), "Sweep one axis at a time"
+    if not dx and not dy:
+        return None
+
+    swept = SWEPT_RECT
+    swept.update(
+        rect.x + min(dx, 0), rect.y + min(dy, 0), rect.w + abs(dx), rect.h + abs(dy)
+    )
+
+    hit = None
+    hit_time = 0.0
+    for collision in get_candidates(rect=swept, collisions=collisions):
+        other = collision.rect
+        if not swept.colliderect(other):
+            continue
+
+        if rect.colliderect(other):
+            moved = MOVED_RECT
+            moved.update(rect.x + dx, rect.y + dy, rect.w, rect.h)
+            if not moved.colliderect(other):
+                continue
+            time = 0.0
+        elif dx > 0:
+            time = (other.left - rect.right) / dx
+        elif dx < 0:
+            time = (other.right - rect.left) / dx
+        elif dy > 0:
+            time = (other.top - rect.bottom) / dy
+        else:
+            time = (other.bottom - rect.top) / dy
+
+        if hit is None or time < hit_time:
+            hit = collision
+            hit_time = time
+
+    if hit is None:
+        return None
+
+    if out is None:
+        out = X_CONTACT if dx else Y_CONTACT
+    out.sprite = hit
+    out.time = hit_time
+    return out
+
+
+def move_rect_swept(
+    rect: Rect, dx: int, dy: int, collisions: Collisions
+) -> Optional[Contact]:
+    """Moves rect along x then y, stopping flush against the first contact."""
+    contact = None
+    if dx:
+        contact = get_swept_contact(rect=rect, dx=dx, dy=0, collisions=collisions)
+        if contact is None:
+            rect.x += dx
+        elif contact.time > 0.0:
+            other = contact.sprite.rect
+            if dx > 0:
+                rect.right = other.left
+            else:
+                rect.left = other.right
+
+    if dy:
+        y_contact = get_swept_contact(rect=rect, dx=0, dy=dy, collisions=collisions)
+        if y_contact is None:
+            rect.y += dy
+        elif y_contact.time > 0.0:
+            other = y_contact.sprite.rect
+            if dy > 0:
+                rect.bottom = other.top
+            else:
+                rect.top = other.bottom
+
+        if contact is None:
+            contact = y_contact
+
+    return contact
+
+
 def get_parabolic_position(time: float, duration: float) -> float:
     return -1 * time**2 + duration * time
 
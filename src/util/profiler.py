@@ -0,0 +1,153 @@
+import csv
+import time
+from pathlib import Path
+from typing import *
+
+import numpy as np
+from absl import flags
+
+from src.util.logger import TextLogger
+
+FLAGS = flags.FLAGS
+
+PERCENTILES = (50, 95, 99)
+# Histogram buckets in milliseconds, the last one catches every long frame
+BUCKET_EDGES_MS = (0.0, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, np.inf)
+
+
+class FrameProfiler:
+    """
+    Times every phase of the game loop into a ring buffer of the last frames.
+    A phase is the time between two laps, so the phases of a frame add up to
+    the whole frame. Only finished frames enter the ring buffer, the summary
+    never sees a frame with its last phases still at zero. Disabled, every
+    call returns before reading the clock.
+    """
+
+    def __init__(
+        self,
+        phases: Iterable[str],
+        frames: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.phases = list(phases)
+        self.columns = {phase: idx for idx, phase in enumerate(self.phases)}
+        self.enabled = FLAGS.game.profiler.enabled if enabled is None else enabled
+
+        frames = FLAGS.game.profiler.frames if frames is None else frames
+        self.samples = np.zeros((frames, len(self.phases)), dtype=np.float64)
+        self.recorded = 0
+        self.row = np.zeros(len(self.phases), dtype=np.float64)
+        self.last = 0.0
+
+        self.overlay: list[str] = []
+
+    def start_frame(self):
+        if not self.enabled:
+            return None
+
+        self.row[:] = 0.0
+        self.last = time.perf_counter()
+
+    def finish_frame(self):
+        if not self.enabled:
+            return None
+
+        self.samples[self.recorded % len(self.samples)] = self.row
+        self.recorded += 1
+
+    def lap(self, phase: str):
+        """Adds the time since the previous lap, a phase may lap many times."""
+        if not self.enabled:
+            return None
+
+        now = time.perf_counter()
+        self.row[self.columns[phase]] += now - self.last
+        self.last = now
+
+    def get_samples(self) -> np.ndarray:
+        """Seconds per frame and phase, oldest frames first."""
+        size = len(self.samples)
+        if self.recorded <= size:
+            return self.samples[: self.recorded]
+        return np.roll(self.samples, -(self.recorded % size), axis=0)
+
+    def get_phase_samples(self) -> dict[str, np.ndarray]:
+        """Milliseconds per phase, the whole frame added last."""
+        samples = self.get_samples() * 1_000
+        return {
+            **{phase: samples[:, idx] for idx, phase in enumerate(self.phases)},
+            "frame": samples.sum(axis=1),
+        }
+
+    def get_summary(self) -> dict[str, tuple[float, ...]]:
+        """The percentiles followed by the max, in milliseconds."""
+        if self.recorded == 0:
+            return {}
+
+        samples = np.column_stack(list(self.get_phase_samples().values()))
+        stats = np.vstack(
+            (np.percentile(samples, PERCENTILES, axis=0), samples.max(axis=0))
+        )
+        return {
+            phase: tuple(stats[:, idx].tolist())
+            for idx, phase in enumerate([*self.phases, "frame"])
+        }
+
+    def get_histograms(self) -> dict[str, np.ndarray]:
+        return {
+            phase: np.histogram(samples, bins=BUCKET_EDGES_MS)[0]
+            for phase, samples in self.get_phase_samples().items()
+        }
+
+    def report(self) -> str:
+        lines = [f"Frame profile: last {len(self.get_samples())} frames (ms)"]
+        for phase, (p50, p95, p99, peak) in self.get_summary().items():
+            lines.append(
+                f"{phase:<12} p50 {p50:7.3f} | p95 {p95:7.3f} | "
+                f"p99 {p99:7.3f} | max {peak:7.3f}"
+            )
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        """One row per phase, the summary then the histogram bucket counts."""
+        summary = self.get_summary()
+        if not summary:
+            return None
+
+        histograms = self.get_histograms()
+        buckets = [
+            f"{low:g}-{high:g}ms" if high < np.inf else f"{low:g}ms+"
+            for low, high in zip(BUCKET_EDGES_MS[:-1], BUCKET_EDGES_MS[1:])
+        ]
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                ["phase", *[f"p{p}_ms" for p in PERCENTILES], "max_ms", *buckets]
+            )
+            for phase, stats in summary.items():
+                writer.writerow(
+                    [
+                        phase,
+                        *[f"{stat:.4f}" for stat in stats],
+                        *histograms[phase].tolist(),
+                    ]
+                )
+        print(f"Frame profile saved to {path}")
+
+    def text_log(self, text_logger: TextLogger):
+        """Refreshed every few frames, percentiles are not free."""
+        if not self.enabled:
+            return None
+
+        if not self.overlay or self.recorded % FLAGS.game.profiler.refresh == 0:
+            self.overlay = [
+                f"{phase}: {p50:.2f} {p95:.2f} {p99:.2f} {peak:.2f}"
+                for phase, (p50, p95, p99, peak) in self.get_summary().items()
+            ]
+
+        text_logger.add_text("p50 p95 p99 max (ms)")
+        for line in self.overlay:
+            text_logger.add_text(line, indented=True)
@@ -0,0 +1,86 @@
+from typing import *
+
+import pygame
+from absl import flags
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+FLAGS = flags.FLAGS
+
+
+class Renderer:
+    """
+    Full mode repaints the background and flips the whole window. Dirty mode
+    only restores the regions drawn last frame from the cached background and
+    presents the union of last and current regions. The background scrolls
+    with the camera by the parallax fraction, tiled to cover any stage.
+    """
+
+    def __init__(
+        self,
+        screen: Surface,
+        background: Surface,
+        dirty: bool = False,
+        parallax: Optional[float] = None,
+    ):
+        self.screen = screen
+        self.background = background
+        self.dirty = dirty
+        self.parallax = FLAGS.game.render.parallax if parallax is None else parallax
+
+        # What clear() restores, the background tiled at the scroll position
+        self.backdrop = background
+        self.tiled: Optional[Surface] = None
+        self.scroll_offset = (0, 0)
+
+        self.previous: list[Rect] = []
+        self.current: list[Rect] = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def scroll(self, offset: tuple[int, int]):
+        """Camera offset in world pixels, only a new position re-tiles."""
+        width, height = self.background.get_size()
+        x = int(offset[0] * self.parallax) % width
+        y = int(offset[1] * self.parallax) % height
+        if (x, y) == self.scroll_offset:
+            return None
+
+        self.scroll_offset = (x, y)
+        self.full_redraw = True
+
+        if self.tiled is None:
+            self.tiled = Surface(self.screen.get_size()).convert(self.screen)
+        screen_width, screen_height = self.tiled.get_size()
+        for tile_x in range(-x, screen_width, width):
+            for tile_y in range(-y, screen_height, height):
+                self.tiled.blit(source=self.background, dest=(tile_x, tile_y))
+        self.backdrop = self.tiled
+
+    def clear(self):
+        if not self.dirty or self.full_redraw:
+            self.screen.blit(source=self.backdrop, dest=(0, 0))
+            return None
+
+        for rect in self.previous:
+            self.screen.blit(source=self.backdrop, dest=rect, area=rect)
+
+    def add(self, rect: Optional[Rect]):
+        if self.dirty and rect:
+            self.current.append(rect)
+
+    def extend(self, rects: Iterable[Optional[Rect]]):
+        for rect in rects:
+            self.add(rect=rect)
+
+    def present(self):
+        if not self.dirty or self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.previous + self.current)
+
+        self.previous = self.current
+        self.current = []
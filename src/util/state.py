@@ -2,6 +2,7 @@ import random
 from dataclasses import dataclass
 from typing import *
 
+import numpy as np
 from absl import flags
 
 from src.util.logger import KEYPAIR_FMT, TextLogger
@@ -10,6 +11,22 @@ FLAGS = flags.FLAGS
 
 Player_ = Any
 
+# One bit per action, packed masks describe many bots in a single array
+ACTION_NAMES = (
+    "move_left",
+    "move_right",
+    "jump_up",
+    "jump_down",
+    "aim_left",
+    "aim_right",
+    "aim_up",
+    "aim_down",
+    "dash",
+    "attack",
+    "defend",
+)
+ACTION_BITS = {name: 1 << idx for idx, name in enumerate(ACTION_NAMES)}
+
 
 @dataclass
 class ActionState:
@@ -42,13 +59,28 @@ class ActionState:
         }
         text_logger.preload_dict(categories=categories)
 
+    @staticmethod
+    def from_bits(bits: int, source: str) -> "ActionState":
+        actions = ActionState(source=source)
+        for name, bit in ACTION_BITS.items():
+            if bits & bit:
+                setattr(actions, name, 1)
+        return actions
+
+    def to_bits(self) -> int:
+        bits = 0
+        for name, bit in ACTION_BITS.items():
+            if getattr(self, name):
+                bits |= bit
+        return bits
+
     @property
     def is_moving(self) -> bool:
-        return any([self.move_left, self.move_right])
+        return bool(self.move_left or self.move_right)
 
     @property
     def is_jumping(self) -> bool:
-        return any([self.jump_up, self.jump_down])
+        return bool(self.jump_up or self.jump_down)
 
     def text_log(self, text_logger: TextLogger):
         text_logger.add(self.source)
@@ -79,7 +111,7 @@ class ActionStateRandomizer:
     STAND: int = 2
 
     def __init__(self):
-        self.fps = FLAGS.game.clock.fps
+        self.fps = FLAGS.game.clock.tick_rate
 
         self.movement_direction = None
         self.movement_duration = None
@@ -181,3 +213,132 @@ class ActionStateRandomizer:
         self.special(actions=new_actions, player=player, computer=computer)
 
         return new_actions
+
+
+class ActionStateBatchRandomizer:
+    """
+    ActionStateRandomizer for many bots at once. Timers live in arrays and
+    every decision is drawn for all bots together from one Generator, the
+    actions come out as packed ACTION_BITS masks.
+    """
+
+    NONE: int = -1
+
+    def __init__(self, count: int, seed: Optional[int] = None):
+        self.count = count
+        self.fps = FLAGS.game.clock.tick_rate
+        self.rng = np.random.default_rng(seed)
+
+        self.movement_direction = np.full(count, self.NONE, dtype=np.int8)
+        self.movement_duration = np.zeros(count, dtype=np.float64)
+        self.movement_counter = np.zeros(count, dtype=np.int64)
+
+        self.action_cooldown = np.ones(count, dtype=np.float64)
+        self.action_counter = np.zeros(count, dtype=np.int64)
+
+        self.special_cooldown = np.ones(count, dtype=np.float64)
+        self.special_counter = np.zeros(count, dtype=np.int64)
+
+        self.bits = np.zeros(count, dtype=np.uint16)
+
+    def set_random_direction(self, computers: np.ndarray, players: np.ndarray):
+        pick = self.movement_direction == self.NONE
+        count = np.count_nonzero(pick)
+        if not count:
+            return None
+
+        computer_x = computers[pick, 0]
+        player_x = players[pick, 0]
+        left_weight = 1 + 3 * (computer_x > player_x)
+        right_weight = 1 + 3 * (computer_x < player_x)
+        roll = self.rng.random(count) * (left_weight + right_weight + 2)
+        direction = np.where(
+            roll < left_weight,
+            ActionStateRandomizer.LEFT,
+            np.where(
+                roll < left_weight + right_weight,
+                ActionStateRandomizer.RIGHT,
+                ActionStateRandomizer.STAND,
+            ),
+        )
+
+        stand_bias = np.where(
+            direction == ActionStateRandomizer.STAND,
+            self.rng.uniform(0.5, 1.5, count),
+            0.0,
+        )
+        lower = self.rng.uniform(0.2, 0.5, count)
+        upper = self.rng.uniform(0.6, 2.4, count)
+        duration = np.where(self.rng.random(count) < 10 / 11, lower, upper)
+
+        self.movement_direction[pick] = direction
+        self.movement_duration[pick] = duration + stand_bias
+        self.movement_counter[pick] = 0
+
+    def move(self, bits: np.ndarray):
+        direction = self.movement_direction
+        self.movement_counter += 1
+        bits[direction == ActionStateRandomizer.RIGHT] |= ACTION_BITS["move_right"]
+        bits[direction == ActionStateRandomizer.LEFT] |= ACTION_BITS["move_left"]
+
+        done = self.movement_counter / self.fps >= self.movement_duration
+        direction[done] = self.NONE
+
+    def action(self, bits: np.ndarray, computers: np.ndarray, players: np.ndarray):
+        ready = self.action_counter / self.fps >= self.action_cooldown
+        self.action_counter[~ready] += 1
+
+        computer_center = computers[:, 0] + computers[:, 2] // 2
+        player_center = players[:, 0] + players[:, 2] // 2
+        ready &= np.abs(player_center - computer_center) <= 100
+        count = np.count_nonzero(ready)
+        if not count:
+            return None
+
+        attack = self.rng.random(count) < 0.5
+        bits[ready] |= np.where(attack, ACTION_BITS["attack"], 0).astype(np.uint16)
+
+        self.action_cooldown[ready] = self.rng.uniform(0.1, 0.3, count)
+        self.action_counter[ready] = 0
+
+    def special(self, bits: np.ndarray, computers: np.ndarray, players: np.ndarray):
+        ready = self.special_counter / self.fps >= self.special_cooldown
+        self.special_counter[~ready] += 1
+        count = np.count_nonzero(ready)
+        if not count:
+            return None
+
+        jump_weight = 1 + (computers[ready, 1] > players[ready, 1])
+        roll = self.rng.random(count) * (jump_weight + 2)
+        dash_right = self.rng.random(count) < 0.5
+        dash = np.where(
+            dash_right,
+            ACTION_BITS["dash"] | ACTION_BITS["move_right"],
+            ACTION_BITS["dash"] | ACTION_BITS["move_left"],
+        )
+        special = np.where(
+            roll < jump_weight,
+            ACTION_BITS["jump_up"],
+            np.where(roll < jump_weight + 1, dash, ACTION_BITS["jump_down"]),
+        )
+        bits[ready] |= special.astype(np.uint16)
+
+        self.special_cooldown[ready] = self.rng.uniform(0.3, 0.5, count)
+        self.special_counter[ready] = 0
+
+    def get_random_actions(
+        self, computers: np.ndarray, players: np.ndarray
+    ) -> np.ndarray:
+        """
+        Rects as (count, 4) arrays of x, y, width and height, each bot
+        against the player at the same row. The masks are reused next tick.
+        """
+        bits = self.bits
+        bits[:] = 0
+
+        self.set_random_direction(computers=computers, players=players)
+        self.move(bits=bits)
+        self.action(bits=bits, computers=computers, players=players)
+        self.special(bits=bits, computers=computers, players=players)
+
+        return bits
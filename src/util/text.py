@@ -1,11 +1,13 @@
+from collections import OrderedDict
 from typing import *
 
 from absl import flags
-from pygame import SRCALPHA
+from pygame import BLEND_PREMULTIPLIED, SRCALPHA, Rect
 from pygame.color import Color
 from pygame.font import Font
 from pygame.surface import Surface
 
+from src.util.image import copy_pixels
 from src.util.types import Coordinate, Pixels
 
 FLAGS = flags.FLAGS
@@ -15,7 +17,82 @@ def get_font(name: str, size: int) -> Font:
     return Font(FLAGS.game.path.ttf[name], size)
 
 
-def get_bitmap(
+TextKey = tuple[Any, ...]
+
+
+class TextCache:
+    """
+    Rendered text by font, text, colors and antialias, shared read-only by
+    every caller. Once the held pixels pass the memory cap, the least
+    recently used surfaces are dropped.
+    """
+
+    def __init__(self, max_nbytes: Optional[int] = None):
+        self.max_nbytes = max_nbytes
+        self.surfaces: OrderedDict[TextKey, Surface] = OrderedDict()
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def limit(self) -> int:
+        if self.max_nbytes is not None:
+            return self.max_nbytes
+        return int(FLAGS.game.cache.text_mib * 2**20)
+
+    @staticmethod
+    def get_nbytes(surface: Surface) -> int:
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def get(self, key: TextKey, create: Callable[[], Surface]) -> Surface:
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = create()
+        self.surfaces[key] = surface
+        self.nbytes += TextCache.get_nbytes(surface=surface)
+
+        limit = self.limit
+        while self.nbytes > limit and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.nbytes -= TextCache.get_nbytes(surface=evicted)
+            self.evictions += 1
+
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.nbytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / max(self.hits + self.misses, 1)
+
+    def report(self) -> str:
+        return (
+            f"Text cache: {len(self.surfaces)} surfaces, "
+            f"{self.nbytes / 2**20:.2f} of {self.limit / 2**20:.2f} MiB | "
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%}), "
+            f"{self.evictions} evicted"
+        )
+
+
+TEXT_CACHE = TextCache()
+
+
+def get_color_key(color: Optional[Color]) -> Optional[tuple[int, ...]]:
+    # pygame.Color is not hashable
+    return None if color is None else tuple(color)
+
+
+def render_bitmap(
     font: Font,
     text: str,
     antialias: bool = True,
@@ -32,6 +109,161 @@ def get_bitmap(
     return bitmap
 
 
+def get_bitmap(
+    font: Font,
+    text: str,
+    antialias: bool = True,
+    color: Color = (255, 255, 255),
+    bgcolor: Optional[Color] = None,
+) -> Surface:
+    """Cached in TEXT_CACHE, the surface must not be drawn on."""
+    key = (
+        "bitmap",
+        font,
+        text,
+        antialias,
+        get_color_key(color),
+        get_color_key(bgcolor),
+    )
+    return TEXT_CACHE.get(
+        key=key,
+        create=lambda: render_bitmap(
+            font=font, text=text, antialias=antialias, color=color, bgcolor=bgcolor
+        ),
+    )
+
+
+# Printable ASCII, other characters are rendered the first time they are seen
+ATLAS_CHARS = "".join(chr(code) for code in range(32, 127))
+
+
+class GlyphAtlas:
+    """
+    Every glyph of a font rendered once into a single surface, any string is
+    then drawn by blitting its glyphs side by side. Matches font.render for
+    fonts without kerning, such as the monospaced JetBrains Mono.
+    """
+
+    def __init__(
+        self,
+        font: Font,
+        antialias: bool = True,
+        color: Color = (255, 255, 255),
+        chars: str = ATLAS_CHARS,
+    ):
+        self.font = font
+        self.antialias = antialias
+        self.color = color
+        self.height = font.get_height()
+
+        glyphs = [font.render(char, antialias, color) for char in chars]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        self.surface = Surface((max(width, 1), self.height), flags=SRCALPHA)
+
+        self.areas: dict[str, Rect] = {}
+        self.extra: dict[str, Surface] = {}
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            copy_pixels(surface=self.surface, source=glyph, dest=(x, 0))
+            self.areas[char] = Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def get_glyph(self, char: str) -> tuple[Surface, Optional[Rect]]:
+        area = self.areas.get(char)
+        if area is not None:
+            return self.surface, area
+
+        glyph = self.extra.get(char)
+        if glyph is None:
+            glyph = self.font.render(char, self.antialias, self.color)
+            self.extra[char] = glyph
+        return glyph, None
+
+    def get_size(self, text: str) -> tuple[int, int]:
+        width = 0
+        for char in text:
+            source, area = self.get_glyph(char=char)
+            width += source.get_width() if area is None else area.w
+        return width, self.height
+
+    def draw(
+        self, surface: Surface, text: str, dest: Coordinate, copy: bool = False
+    ) -> Rect:
+        """Copies the glyphs instead of blending them onto a cleared surface."""
+        x, y = dest
+        for char in text:
+            source, area = self.get_glyph(char=char)
+            if copy:
+                copy_pixels(surface=surface, source=source, dest=(x, y), area=area)
+            else:
+                surface.blit(source, (x, y), area)
+            x += source.get_width() if area is None else area.w
+        return Rect(dest[0], y, x - dest[0], self.height)
+
+    def render(self, text: str) -> Surface:
+        """A new surface, like font.render without rasterizing the text."""
+        text_surface = Surface(self.get_size(text=text), flags=SRCALPHA)
+        self.draw(surface=text_surface, text=text, dest=(0, 0), copy=True)
+        return text_surface
+
+
+GLYPH_ATLASES: dict[tuple[str, int], GlyphAtlas] = {}
+
+
+def get_glyph_atlas(name: str, size: int) -> GlyphAtlas:
+    """White antialiased glyphs, shared by every user of the font and size."""
+    key = (name, size)
+    if key not in GLYPH_ATLASES:
+        GLYPH_ATLASES[key] = GlyphAtlas(font=get_font(name=name, size=size))
+    return GLYPH_ATLASES[key]
+
+
+def render_shadowed_bitmap(
+    text: str,
+    font: Font,
+    distance: Pixels = 1,
+    color: Color = (255, 255, 255),
+    bgcolor: Optional[Color] = None,
+) -> Surface:
+    """
+    Shadow and text in one premultiplied surface, blit it with
+    BLEND_PREMULTIPLIED. Plain blending onto a transparent surface would
+    darken the antialiased edges.
+    """
+    white = render_bitmap(font=font, text=text, color=color, bgcolor=bgcolor)
+    black = render_bitmap(font=font, text=text, color=(0, 0, 0))
+
+    width, height = white.get_size()
+    bitmap = Surface((width + distance, height + distance), SRCALPHA)
+    # Copied first, premul_alpha misreads the padded rows of font.render
+    bitmap.blit(black.copy().premul_alpha(), (distance, distance))
+    bitmap.blit(white.copy().premul_alpha(), (0, 0), special_flags=BLEND_PREMULTIPLIED)
+    return bitmap
+
+
+def get_shadowed_bitmap(
+    text: str,
+    font: Font,
+    distance: Pixels = 1,
+    color: Color = (255, 255, 255),
+    bgcolor: Optional[Color] = None,
+) -> Surface:
+    key = (
+        "shadowed",
+        font,
+        text,
+        distance,
+        get_color_key(color),
+        get_color_key(bgcolor),
+    )
+    return TEXT_CACHE.get(
+        key=key,
+        create=lambda: render_shadowed_bitmap(
+            text=text, font=font, distance=distance, color=color, bgcolor=bgcolor
+        ),
+    )
+
+
 def blit_text_shadowed(
     text: str,
     font: Font,
@@ -40,9 +272,8 @@ def blit_text_shadowed(
     distance: Pixels = 1,
     color: Color = (255, 255, 255),
     bgcolor: Optional[Color] = None,
-):
-    white = get_bitmap(font=font, text=text, color=color, bgcolor=bgcolor)
-    black = get_bitmap(font=font, text=text, color=(0, 0, 0))
-
-    surface.blit(black, (coord[0] + distance, coord[1] + distance))
-    surface.blit(white, coord)
+) -> Rect:
+    bitmap = get_shadowed_bitmap(
+        text=text, font=font, distance=distance, color=color, bgcolor=bgcolor
+    )
+    return surface.blit(bitmap, coord, special_flags=BLEND_PREMULTIPLIED)
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import *
+
+import numpy as np
+from absl import flags
+
+from src.util.math import get_parabolic_peak_time, get_parabolic_position
+from src.util.types import Pixels, Seconds
+
+FLAGS = flags.FLAGS
+
+TrajectoryKey = tuple[Seconds, Pixels, int]
+
+# Times this close to a tick are looked up without interpolating, it absorbs
+# the drift of a time accumulated from fixed deltas
+TICK_SNAP = 1e-6
+
+
+def get_jump_offset(time: Seconds, duration: Seconds, length: Pixels) -> Pixels:
+    """Height above the starting point, the arc the tables are sampled from."""
+    peak_position = get_parabolic_position(
+        time=get_parabolic_peak_time(duration=duration), duration=duration
+    )
+    position = get_parabolic_position(time=time, duration=duration)
+    return length * round(position / peak_position, 3)
+
+
+@dataclass(frozen=True)
+class JumpTrajectory:
+    """
+    Jump arc sampled once per tick, from the start to a couple of ticks past
+    the duration. Times between ticks are linearly interpolated.
+    """
+
+    duration: Seconds
+    length: Pixels
+    tick_rate: int
+    offsets: tuple[Pixels, ...]
+
+    def get_offset(self, time: Seconds) -> Pixels:
+        offsets = self.offsets
+        position = time * self.tick_rate
+        idx = round(position)
+        if abs(position - idx) < TICK_SNAP:
+            if 0 <= idx < len(offsets):
+                return offsets[idx]
+        else:
+            idx = int(position)
+            if 0 <= idx < len(offsets) - 1:
+                before = offsets[idx]
+                return before + (offsets[idx + 1] - before) * (position - idx)
+
+        return get_jump_offset(time=time, duration=self.duration, length=self.length)
+
+
+def create_jump_trajectory(
+    duration: Seconds, length: Pixels, tick_rate: int
+) -> JumpTrajectory:
+    ticks = int(np.ceil(duration * tick_rate)) + 2
+    times = np.arange(ticks + 1, dtype=np.float64) / tick_rate
+
+    peak_time = get_parabolic_peak_time(duration=duration)
+    peak_position = get_parabolic_position(time=peak_time, duration=duration)
+    positions = -1 * times**2 + duration * times
+    offsets = length * np.round(positions / peak_position, 3)
+
+    # Python floats, indexing a list is much faster than an ndarray
+    return JumpTrajectory(
+        duration=duration,
+        length=length,
+        tick_rate=tick_rate,
+        offsets=tuple(offsets.tolist()),
+    )
+
+
+TRAJECTORIES: dict[TrajectoryKey, JumpTrajectory] = {}
+
+
+def get_jump_trajectory(
+    duration: Seconds, length: Pixels, tick_rate: Optional[int] = None
+) -> JumpTrajectory:
+    """Shared between every jump with the same parameters."""
+    if tick_rate is None:
+        tick_rate = FLAGS.game.clock.tick_rate
+
+    key = (duration, length, tick_rate)
+    if key not in TRAJECTORIES:
+        TRAJECTORIES[key] = create_jump_trajectory(
+            duration=duration, length=length, tick_rate=tick_rate
+        )
+    return TRAJECTORIES[key]
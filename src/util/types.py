@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import *
 
+import numpy as np
 from pygame.surface import Surface
 
 # Unit of Measurements
@@ -45,6 +46,18 @@ class SpritesheetDict:
     image: Surface
     frames: SpritesheetFrameData
     tags: list[SpritesheetTagData]
+    digest: str = ""
+    slices: dict[str, np.ndarray] = field(default_factory=dict)
+
+
+@dataclass
+class StageDict:
+    """Tile ids index the palette, zero is an empty cell."""
+
+    tile_size: int
+    palette: list[tuple[int, int, int, int]]
+    layers: dict[str, np.ndarray]
+    collision: list[str] = field(default_factory=list)
 
 
 @dataclass